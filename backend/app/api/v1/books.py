@@ -3,13 +3,22 @@ Books API Endpoints - Integration with Google Books and EPUB Scrapers
 """
 
 from datetime import datetime
+from urllib.parse import urlparse
+from dataclasses import dataclass
 import asyncio
+import errno
+import os
+import re
+import shutil
 from pathlib import Path
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, undefer_group
+from sqlalchemy.orm.attributes import flag_modified
+from sqlalchemy import or_, and_, func, select, insert, update, exists
 from typing import List, Optional
-from app.database import get_db
+from app.database import get_async_db, AsyncSessionLocal
 from app.models.book import Book
 from app.models.book_chapter import BookChapter
 from app.models.download import DownloadQueue
@@ -26,12 +35,85 @@ from app.schemas.book import (
 )
 from app.services.google_books import get_google_books_service
 from app.services.openlibrary import get_openlibrary_service
-from app.services.book_scrapers import LectulandiaScraper
+from app.services.book_scrapers import get_lectulandia_scraper
 import logging
-from slugify import slugify
+from app.utils.text import cached_slugify
+from app.utils.rate_limit import AdaptiveHostLimiter
 
 logger = logging.getLogger(__name__)
 
+# Deferred Book counters that BookResponse exposes
+CHAPTER_COUNT_FIELDS = ["total_chapters", "downloaded_chapters"]
+
+# Download button selectors for intermediate file hosts resolved with Playwright
+KRAKEN_SELECTORS = [
+    'button.btn-primary:has-text("Download")',
+    'button:has-text("Download now")',
+    'a:has-text("Download now")',
+    'button.btn-primary',
+    'a.download-url',
+    'a[href*="krakenfiles.com/file/"]',
+    'button:has-text("Free Download")',
+    'a:has-text("Free Download")',
+    'a.btn-primary',
+    '.download-button',
+    'a[href*="/file/"]'
+]
+FINAL_DOWNLOAD_SELECTORS = ['button:has-text("Download"), a:has-text("Download"), button.download, a.download']
+GENERIC_SELECTORS = ['a.btn-download, a[href*="download"], button:has-text("Download")']
+
+# Bounds concurrent requests per download host, backing off on 429s and timeouts
+HOST_LIMITER = AdaptiveHostLimiter(max_concurrency=3)
+
+# Returns the first visible element matching any selector, scanning the DOM
+# in the browser. Understands Playwright's :has-text("...") pseudo-class.
+_FIND_DOWNLOAD_CONTROL_JS = """(selectors) => {
+    const visible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const query = part => {
+        const m = part.match(/^(.*):has-text\\("(.*)"\\)$/);
+        if (!m) {
+            try { return Array.from(document.querySelectorAll(part)); } catch (e) { return []; }
+        }
+        const needle = m[2].toLowerCase();
+        let candidates;
+        try { candidates = Array.from(document.querySelectorAll(m[1] || '*')); } catch (e) { return []; }
+        return candidates.filter(el => (el.innerText || '').toLowerCase().includes(needle));
+    };
+    for (const selector of selectors) {
+        for (const part of selector.split(',')) {
+            const el = query(part.trim()).find(visible);
+            if (el) return el;
+        }
+    }
+    return null;
+}"""
+
+# Anything but letters, digits, spaces, hyphens and underscores is dropped from filenames
+_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w \-]')
+
+# Snapshot of every link and button on a page, gathered in a single evaluate call
+_COLLECT_ELEMENTS_JS = """() => ({
+    links: Array.from(document.querySelectorAll('a')).map(a => ({
+        href: a.getAttribute('href') ? a.href : null,
+        text: a.innerText,
+        visible: !!(a.offsetWidth || a.offsetHeight || a.getClientRects().length),
+        cls: a.getAttribute('class')
+    })),
+    buttons: Array.from(document.querySelectorAll('button')).map(b => ({
+        text: b.innerText,
+        cls: b.getAttribute('class')
+    }))
+})"""
+
+# Intermediate host -> (button selectors, tag)
+HOST_DISPATCH = {
+    'krakenfiles.com': (KRAKEN_SELECTORS, 'kraken'),
+    'antupload.com': (['#downloadB'], 'antupload'),
+    'beeupload.com': (GENERIC_SELECTORS, 'generic'),
+    'beeupload.net': (GENERIC_SELECTORS, 'generic'),
+    'fireload.com': (GENERIC_SELECTORS, 'generic'),
+}
+
 router = APIRouter(prefix="/books", tags=["books"])
 
 
@@ -46,7 +128,7 @@ async def search_books(
     limit: int = Query(20, ge=1, le=40),
     language: Optional[str] = Query(None, description="Language filter (es, en, etc.)"),
     source: str = Query("all", description="Search source (all, google, openlibrary, scrapers, lectulandia)"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Search books on Google Books, Open Library, or EPUB scrapers
@@ -62,90 +144,108 @@ async def search_books(
     results = []
 
     try:
-        # Search in Google Books
+        # Launch the remote searches concurrently
+        searches = {}
+
         if source in ["all", "google"]:
             google_books = get_google_books_service()
-            search_results = await google_books.search_books(q, page=page, per_page=limit, language=language)
+            searches['google_books'] = google_books.search_books(q, page=page, per_page=limit, language=language)
+        elif source == "openlibrary":
+            openlibrary = get_openlibrary_service()
+            searches['openlibrary'] = openlibrary.search_books(q, page=page, per_page=limit)
+
+        # Only search Lectulandia (most reliable with Playwright)
+        if source in ["all", "scrapers", "lectulandia"]:
+            lectulandia = get_lectulandia_scraper()
+            searches['lectulandia'] = lectulandia.search(q, page=page)
+
+        responses = dict(zip(
+            searches.keys(),
+            await asyncio.gather(*searches.values(), return_exceptions=True)
+        ))
+
+        # Google Books results
+        if 'google_books' in responses:
+            search_results = responses['google_books']
+            if isinstance(search_results, Exception):
+                raise search_results
+
+            # Check which results are already in library (single query)
+            library_ids = await _library_ids_by(
+                db, Book.google_books_id,
+                [item.get('google_books_id') for item in search_results['results']]
+            )
 
             for item in search_results['results']:
-                # Check if already in library
-                in_library = db.query(Book).filter(
-                    Book.google_books_id == item.get('google_books_id')
-                ).first()
+                library_id = library_ids.get(item.get('google_books_id'))
 
                 results.append({
                     **item,
-                    'in_library': bool(in_library),
-                    'library_id': in_library.id if in_library else None,
+                    'in_library': library_id is not None,
+                    'library_id': library_id,
                     'source': 'google_books'
                 })
 
-        # Search in Open Library
-        elif source == "openlibrary":
-            openlibrary = get_openlibrary_service()
-            search_results = await openlibrary.search_books(q, page=page, per_page=limit)
+        # Open Library results
+        if 'openlibrary' in responses:
+            search_results = responses['openlibrary']
+            if isinstance(search_results, Exception):
+                raise search_results
+
+            library_ids = await _library_ids_by(
+                db, Book.openlibrary_id,
+                [item.get('openlibrary_id') for item in search_results['results']]
+            )
 
             for item in search_results['results']:
-                in_library = db.query(Book).filter(
-                    Book.openlibrary_id == item.get('openlibrary_id')
-                ).first()
+                library_id = library_ids.get(item.get('openlibrary_id'))
 
                 results.append({
                     **item,
-                    'in_library': bool(in_library),
-                    'library_id': in_library.id if in_library else None,
+                    'in_library': library_id is not None,
+                    'library_id': library_id,
                     'source': 'openlibrary'
                 })
 
-        # Search in scrapers
-        if source in ["all", "scrapers", "lectulandia"]:
-            scraper_results = []
+        # Scraper results
+        if 'lectulandia' in responses:
+            lect_results = responses['lectulandia']
+
+            if isinstance(lect_results, Exception):
+                logger.error(f"Lectulandia search error: {lect_results}")
+            else:
+                # Check by title (fuzzy match)
+                # Note: Can't use .contains() on JSON field in PostgreSQL easily
+                library_ids = await _library_ids_by_title(
+                    db, [item['title'] for item in lect_results]
+                )
 
-            # Only search Lectulandia (most reliable with Playwright)
-            if source in ["all", "scrapers", "lectulandia"]:
-                try:
-                    lectulandia = LectulandiaScraper()
-                    lect_results = await lectulandia.search(q, page=page)
-
-                    for item in lect_results:
-                        # Check by title (fuzzy match)
-                        # Note: Can't use .contains() on JSON field in PostgreSQL easily
-                        in_library = db.query(Book).filter(
-                            Book.title.ilike(f"%{item['title'][:40]}%")
-                        ).first()
-
-                        scraper_results.append({
-                            'title': item['title'],
-                            'cover_image': item.get('cover'),
-                            'thumbnail': item.get('cover'),
-                            'source': 'lectulandia',
-                            'source_url': item['url'],
-                            'in_library': bool(in_library),
-                            'library_id': in_library.id if in_library else None,
-                            # Add placeholders for fields expected by frontend
-                            'authors': [],
-                            'google_books_id': None,
-                            'description': None,
-                            'published_date': None,
-                            'publisher': None,
-                        })
-                except Exception as e:
-                    logger.error(f"Lectulandia search error: {e}")
-
-            # Add scraper results to main results
-            results.extend(scraper_results)
-
-        # Remove duplicates by title (case-insensitive)
-        seen_titles = set()
-        unique_results = []
+                for item in lect_results:
+                    library_id = library_ids.get(item['title'][:40].lower())
+
+                    results.append({
+                        'title': item['title'],
+                        'cover_image': item.get('cover'),
+                        'thumbnail': item.get('cover'),
+                        'source': 'lectulandia',
+                        'source_url': item['url'],
+                        'in_library': library_id is not None,
+                        'library_id': library_id,
+                        # Add placeholders for fields expected by frontend
+                        'authors': [],
+                        'google_books_id': None,
+                        'description': None,
+                        'published_date': None,
+                        'publisher': None,
+                    })
+
+        # Remove duplicates by title (case-insensitive), keeping first occurrence
+        unique = {}
         for result in results:
-            title_key = result['title'].lower().strip()
-            if title_key not in seen_titles:
-                seen_titles.add(title_key)
-                unique_results.append(result)
+            unique.setdefault(result['title'].lower().strip(), result)
 
         # Limit results
-        unique_results = unique_results[:limit]
+        unique_results = list(unique.values())[:limit]
 
         return BookSearchResponse(
             results=unique_results,
@@ -163,31 +263,30 @@ async def search_books(
 # LIBRARY MANAGEMENT
 # ============================================================================
 
-@router.get("/library", response_model=List[BookResponse])
+@router.get("/library", response_model=List[BookResponse], response_class=ORJSONResponse)
 async def get_library(
     monitored: Optional[bool] = Query(None, description="Filter by monitored status"),
     search: Optional[str] = Query(None, description="Search in library"),
     sort: str = Query("title", description="Sort by: title, rating, recent"),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get books library with filtering and sorting
     """
-    query = db.query(Book)
+    query = select(Book).options(undefer_group("chapter_counts"))
 
     # Apply filters
     if monitored is not None:
-        query = query.filter(Book.monitored == monitored)
+        query = query.where(Book.monitored == monitored)
 
     if search:
         search_term = f"%{search}%"
-        query = query.filter(
+        query = query.where(
             or_(
                 Book.title.ilike(search_term),
-                Book.title_original.ilike(search_term),
-                func.json_array_length(Book.authors) > 0
+                Book.title_original.ilike(search_term)
             )
         )
 
@@ -201,32 +300,33 @@ async def get_library(
 
     # Pagination
     offset = (page - 1) * limit
-    books = query.offset(offset).limit(limit).all()
-
-    # Add computed fields
-    result = []
-    for book in books:
-        book_dict = BookResponse.from_orm(book).dict()
-        book_dict['total_chapters'] = book.total_chapters
-        book_dict['downloaded_chapters'] = book.downloaded_chapters
-        result.append(BookResponse(**book_dict))
+    query = query.offset(offset).limit(limit)
 
-    return result
+    # At most one page (<= 100 rows): load it fully so a DB error is a clean 500.
+    # The ORM rows are validated once, by the response_model
+    return (await db.scalars(query)).all()
 
 
 @router.get("/library/stats", response_model=BookLibraryStats)
-async def get_library_stats(db: Session = Depends(get_db)):
+async def get_library_stats(db: AsyncSession = Depends(get_async_db)):
     """
     Get library statistics
     """
-    total_books = db.query(Book).count()
-    monitored_books = db.query(Book).filter(Book.monitored == True).count()
+    # One conditional-aggregate query per table
+    total_books, monitored_books = (await db.execute(
+        select(
+            func.count(Book.id),
+            func.count(Book.id).filter(Book.monitored == True)
+        )
+    )).one()
 
-    total_files = db.query(BookChapter).count()
-    downloaded_files = db.query(BookChapter).filter(
-        BookChapter.status.in_(["downloaded", "sent"])
-    ).count()
-    sent_files = db.query(BookChapter).filter(BookChapter.status == "sent").count()
+    total_files, downloaded_files, sent_files = (await db.execute(
+        select(
+            func.count(BookChapter.id),
+            func.count(BookChapter.id).filter(BookChapter.status.in_(["downloaded", "sent"])),
+            func.count(BookChapter.id).filter(BookChapter.status == "sent")
+        )
+    )).one()
 
     return BookLibraryStats(
         total_books=total_books,
@@ -238,49 +338,56 @@ async def get_library_stats(db: Session = Depends(get_db)):
 
 
 @router.get("/{book_id}/stats")
-async def get_book_stats(book_id: int, db: Session = Depends(get_db)):
+async def get_book_stats(book_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get download statistics for a specific book
     """
-    book = db.query(Book).filter(Book.id == book_id).first()
-    if not book:
+    book_exists = await db.scalar(select(Book.id).where(Book.id == book_id))
+    if not book_exists:
         raise HTTPException(status_code=404, detail="Book not found")
 
-    # Count chapters by status
-    chapters = db.query(BookChapter).filter(BookChapter.book_id == book_id).all()
+    # Count chapters by status in the database
+    rows = (await db.execute(
+        select(BookChapter.status, func.count(BookChapter.id))
+        .where(BookChapter.book_id == book_id)
+        .group_by(BookChapter.status)
+    )).all()
+    by_status = dict(rows)
+
+    sent_to_kindle = await db.scalar(
+        select(func.count(BookChapter.id)).where(
+            BookChapter.book_id == book_id,
+            or_(BookChapter.status == "sent", BookChapter.sent_at.is_not(None))
+        )
+    )
 
     stats = {
-        "total_chapters": len(chapters),
-        "downloaded": sum(1 for c in chapters if c.status in ["downloaded", "converted"]),
-        "downloading": sum(1 for c in chapters if c.status == "downloading"),
-        "pending": sum(1 for c in chapters if c.status == "pending"),
-        "failed": sum(1 for c in chapters if c.status == "error"),
-        "sent_to_kindle": sum(1 for c in chapters if c.status == "sent" or c.sent_at)
+        "total_chapters": sum(by_status.values()),
+        "downloaded": by_status.get("downloaded", 0) + by_status.get("converted", 0),
+        "downloading": by_status.get("downloading", 0),
+        "pending": by_status.get("pending", 0),
+        "failed": by_status.get("error", 0),
+        "sent_to_kindle": sent_to_kindle or 0
     }
 
     return stats
 
 
 @router.get("/{book_id}", response_model=BookDetailResponse)
-async def get_book(book_id: int, db: Session = Depends(get_db)):
+async def get_book(book_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get detailed book information with chapters
     """
-    book = db.query(Book).filter(Book.id == book_id).first()
+    # Load book and its chapters (ordered by number) together
+    book = (await db.execute(
+        select(Book)
+        .options(selectinload(Book.chapters), undefer_group("chapter_counts"))
+        .where(Book.id == book_id)
+    )).scalar_one_or_none()
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
 
-    # Get chapters
-    chapters = db.query(BookChapter).filter(
-        BookChapter.book_id == book_id
-    ).order_by(BookChapter.number.asc()).all()
-
-    book_dict = BookResponse.from_orm(book).dict()
-    book_dict['total_chapters'] = book.total_chapters
-    book_dict['downloaded_chapters'] = book.downloaded_chapters
-    book_dict['chapters'] = [BookChapterResponse.from_orm(ch) for ch in chapters]
-
-    return BookDetailResponse(**book_dict)
+    return BookDetailResponse.from_orm(book)
 
 
 # ============================================================================
@@ -291,16 +398,16 @@ async def get_book(book_id: int, db: Session = Depends(get_db)):
 async def add_book_from_google_books(
     data: BookCreateFromGoogleBooks,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add book to library from Google Books ID
     Automatically searches all scrapers for download links
     """
     # Check if already exists
-    existing = db.query(Book).filter(
-        Book.google_books_id == data.google_books_id
-    ).first()
+    existing = await db.scalar(
+        select(exists().where(Book.google_books_id == data.google_books_id))
+    )
 
     if existing:
         raise HTTPException(status_code=400, detail="Book already in library")
@@ -315,7 +422,7 @@ async def add_book_from_google_books(
     # Create book
     book = Book(
         title=metadata['title'],
-        slug=slugify(metadata['title']),
+        slug=await _unique_book_slug(db, cached_slugify(metadata['title'])),
         google_books_id=metadata['google_books_id'],
         subtitle=metadata.get('subtitle'),
         description=metadata.get('description'),
@@ -340,8 +447,8 @@ async def add_book_from_google_books(
     )
 
     db.add(book)
-    db.commit()
-    db.refresh(book)
+    await db.commit()
+    await db.refresh(book, CHAPTER_COUNT_FIELDS)
 
     # Search in scrapers in background
     background_tasks.add_task(_search_scrapers_for_book, book.id, metadata['title'])
@@ -349,19 +456,23 @@ async def add_book_from_google_books(
     return BookResponse.from_orm(book)
 
 
-@router.post("/from-url", response_model=BookResponse)
+@router.post("/from-url", response_model=BookResponse, status_code=202)
 async def add_book_from_url(
     data: BookCreateFromURL,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add book from scraper URL directly
+
+    Stores a placeholder book (scrape_status "pending_scrape") and scrapes
+    the page (plus optional Google Books enrichment) in the background.
+    Poll GET /books/{id}: scrape_status is cleared once the book is filled
+    in, or set to "scrape_failed" with scrape_error if scraping fails.
     """
     # Detect scraper from URL
     scrapers = {
-        'epubera': EpuberaScraper(),
-        'lectulandia': LectulandiaScraper()
+        'lectulandia': get_lectulandia_scraper()
     }
 
     scraper_name = data.scraper_name
@@ -374,60 +485,31 @@ async def add_book_from_url(
         else:
             raise HTTPException(status_code=400, detail="Could not detect scraper from URL")
 
-    scraper = scrapers.get(scraper_name)
-    if not scraper:
+    if scraper_name not in scrapers:
         raise HTTPException(status_code=400, detail=f"Unknown scraper: {scraper_name}")
 
-    # Scrape book page
-    result = await scraper.get_download_links(data.source_url)
+    # Create placeholder book (title from the URL until the page is scraped)
+    placeholder_title = data.source_url.rstrip('/').rsplit('/', 1)[-1].replace('-', ' ') or data.source_url
 
-    if not result.success:
-        raise HTTPException(status_code=400, detail=f"Scraping failed: {result.error}")
-
-    # Create book
     book = Book(
-        title=result.title,
-        slug=slugify(result.title),
-        description=result.description,
-        cover_image=result.cover_image,
+        title=placeholder_title,
+        slug=await _unique_book_slug(db, cached_slugify(placeholder_title)),
         language="es",
         monitored=data.monitored,
         auto_download=data.auto_download,
         source_urls={scraper_name: data.source_url},
-        preferred_source=scraper_name
+        preferred_source=scraper_name,
+        scrape_status="pending_scrape"
     )
 
-    # Try to enrich with Google Books metadata if provided
-    if data.google_books_id:
-        google_books = get_google_books_service()
-        metadata = await google_books.get_book_by_id(data.google_books_id)
-        if metadata:
-            book.google_books_id = metadata['google_books_id']
-            book.authors = metadata.get('authors', [])
-            book.publisher = metadata.get('publisher')
-            book.published_date = metadata.get('published_date')
-            book.isbn_10 = metadata.get('isbn_10')
-            book.isbn_13 = metadata.get('isbn_13')
-            book.categories = metadata.get('categories', [])
-            book.average_rating = metadata.get('average_rating')
-
     db.add(book)
-    db.commit()
-    db.refresh(book)
-
-    # Create chapter entry for download
-    if result.best_link:
-        chapter = BookChapter(
-            book_id=book.id,
-            number=1,
-            title=result.title,
-            download_url=result.best_link.url,
-            backup_url=result.backup_link.url if result.backup_link else None,
-            source=scraper_name,
-            status="pending"
-        )
-        db.add(chapter)
-        db.commit()
+    await db.commit()
+    await db.refresh(book, CHAPTER_COUNT_FIELDS)
+
+    # Scrape book page in background
+    background_tasks.add_task(
+        _scrape_book_from_url, book.id, scraper_name, data.source_url, data.google_books_id
+    )
 
     return BookResponse.from_orm(book)
 
@@ -440,38 +522,40 @@ async def add_book_from_url(
 async def update_book(
     book_id: int,
     data: BookUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update book settings
     """
-    book = db.query(Book).filter(Book.id == book_id).first()
+    # Update fields in a single UPDATE ... RETURNING
+    update_data = data.dict(exclude_unset=True)
+
+    book = (await db.execute(
+        update(Book)
+        .where(Book.id == book_id)
+        .values(**update_data, updated_at=datetime.utcnow())
+        .returning(Book)
+    )).scalar_one_or_none()
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
 
-    # Update fields
-    update_data = data.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(book, field, value)
-
-    book.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(book)
+    await db.commit()
+    await db.refresh(book, CHAPTER_COUNT_FIELDS)
 
     return BookResponse.from_orm(book)
 
 
 @router.delete("/{book_id}")
-async def delete_book(book_id: int, db: Session = Depends(get_db)):
+async def delete_book(book_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Delete book from library
     """
-    book = db.query(Book).filter(Book.id == book_id).first()
+    book = await db.get(Book, book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
 
-    db.delete(book)
-    db.commit()
+    await db.delete(book)
+    await db.commit()
 
     return {"message": "Book deleted successfully"}
 
@@ -480,17 +564,17 @@ async def delete_book(book_id: int, db: Session = Depends(get_db)):
 async def refresh_book(
     book_id: int,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Refresh book - re-check scrapers for new files
     """
-    book = db.query(Book).filter(Book.id == book_id).first()
-    if not book:
+    title = await db.scalar(select(Book.title).where(Book.id == book_id))
+    if title is None:
         raise HTTPException(status_code=404, detail="Book not found")
 
     # Re-search scrapers
-    background_tasks.add_task(_search_scrapers_for_book, book.id, book.title)
+    background_tasks.add_task(_search_scrapers_for_book, book_id, title)
 
     return {"message": "Refresh started"}
 
@@ -500,69 +584,79 @@ async def refresh_book(
 # ============================================================================
 
 @router.get("/{book_id}/chapters", response_model=List[BookChapterResponse])
-async def get_book_chapters(book_id: int, db: Session = Depends(get_db)):
+async def get_book_chapters(book_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get chapters for a book
     """
-    book = db.query(Book).filter(Book.id == book_id).first()
+    book = (await db.execute(
+        select(Book).options(selectinload(Book.chapters)).where(Book.id == book_id)
+    )).scalar_one_or_none()
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
 
-    chapters = db.query(BookChapter).filter(
-        BookChapter.book_id == book_id
-    ).order_by(BookChapter.number.asc()).all()
-
-    return [BookChapterResponse.from_orm(ch) for ch in chapters]
+    return [BookChapterResponse.from_orm(ch) for ch in book.chapters]
 
 
 @router.post("/{book_id}/chapters/download", status_code=202)
 async def download_chapters(
     book_id: int,
     data: ChapterDownloadRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Queue selected chapters for download using the download queue system
     """
-    book = db.query(Book).filter(Book.id == book_id).first()
-    if not book:
+    book_exists = await db.scalar(select(Book.id).where(Book.id == book_id))
+    if not book_exists:
         raise HTTPException(status_code=404, detail="Book not found")
 
     # Verify chapters exist
-    chapters = db.query(BookChapter).filter(
-        BookChapter.id.in_(data.chapter_ids),
-        BookChapter.book_id == book_id
-    ).all()
+    chapters = (await db.execute(
+        select(BookChapter.id, BookChapter.status).where(
+            BookChapter.id.in_(data.chapter_ids),
+            BookChapter.book_id == book_id
+        )
+    )).all()
 
     if len(chapters) != len(data.chapter_ids):
         raise HTTPException(status_code=400, detail="Some chapter IDs are invalid")
 
-    queued_count = 0
+    chapter_ids = [chapter_id for chapter_id, status in chapters if status in ["pending", "error"]]
+    queue_rows = []
 
-    # Add to download queue
-    for chapter in chapters:
-        if chapter.status in ["pending", "error"]:
-            # Check if already in queue
-            existing = db.query(DownloadQueue).filter(
-                DownloadQueue.book_chapter_id == chapter.id,
+    if chapter_ids:
+        # Check which chapters are already in queue (single query)
+        already_queued = set((await db.execute(
+            select(DownloadQueue.book_chapter_id).where(
+                DownloadQueue.book_chapter_id.in_(chapter_ids),
                 DownloadQueue.status.in_(['queued', 'downloading'])
-            ).first()
-
-            if not existing:
-                # Add to queue
-                queue_item = DownloadQueue(
-                    book_chapter_id=chapter.id,
-                    content_type='book',
-                    status='queued',
-                    priority=0
-                )
-                db.add(queue_item)
-                queued_count += 1
+            )
+        )).scalars())
+
+        # Add to queue with one bulk INSERT
+        queue_rows = [
+            {
+                'book_chapter_id': chapter_id,
+                'content_type': 'book',
+                'status': 'queued',
+                'priority': 0
+            }
+            for chapter_id in chapter_ids
+            if chapter_id not in already_queued
+        ]
+        if queue_rows:
+            await db.execute(insert(DownloadQueue), queue_rows)
+
+        # Mark chapters as downloading
+        await db.execute(
+            update(BookChapter)
+            .where(BookChapter.id.in_(chapter_ids))
+            .values(status="downloading")
+        )
 
-            # Mark chapter as downloading
-            chapter.status = "downloading"
+    await db.commit()
 
-    db.commit()
+    queued_count = len(queue_rows)
 
     return {
         "status": "queued",
@@ -576,7 +670,7 @@ async def download_chapters(
 async def send_book_to_kindle(
     book_id: int,
     chapter_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Send downloaded book EPUB to Kindle via STK
@@ -593,10 +687,12 @@ async def send_book_to_kindle(
         )
 
     # Get book chapter
-    chapter = db.query(BookChapter).filter(
-        BookChapter.id == chapter_id,
-        BookChapter.book_id == book_id
-    ).first()
+    chapter = (await db.execute(
+        select(BookChapter).where(
+            BookChapter.id == chapter_id,
+            BookChapter.book_id == book_id
+        )
+    )).scalars().first()
 
     if not chapter:
         raise HTTPException(status_code=404, detail="Book chapter not found")
@@ -613,7 +709,7 @@ async def send_book_to_kindle(
         )
 
     # Get book info
-    book = db.query(Book).filter(Book.id == book_id).first()
+    book = await db.get(Book, book_id)
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
 
@@ -624,7 +720,7 @@ async def send_book_to_kindle(
 
     # Get device serials from settings
     device_serials = None
-    settings = db.query(AppSettings).first()
+    settings = (await db.execute(select(AppSettings))).scalars().first()
     if settings and settings.stk_device_serial:
         device_serials = [settings.stk_device_serial]
         logger.info(f"Using saved device: {settings.stk_device_name or settings.stk_device_serial}")
@@ -634,7 +730,9 @@ async def send_book_to_kindle(
     if chapter.title and chapter.title != book.title:
         title = f"{book.title} - {chapter.title}"
 
-    result = sender.send_file(
+    # send_file is a blocking upload; run it in a worker thread
+    result = await asyncio.to_thread(
+        sender.send_file,
         file_path=file_path,
         title=title,
         author=author,
@@ -642,9 +740,12 @@ async def send_book_to_kindle(
     )
 
     if result['success']:
-        chapter.sent_at = datetime.utcnow()
-        chapter.status = "sent"
-        db.commit()
+        await db.execute(
+            update(BookChapter)
+            .where(BookChapter.id == chapter.id)
+            .values(status="sent", sent_at=datetime.utcnow())
+        )
+        await db.commit()
 
         logger.info(f"Sent {file_path.name} to Kindle")
         return {
@@ -661,70 +762,366 @@ async def send_book_to_kindle(
 # HELPER FUNCTIONS
 # ============================================================================
 
+async def _library_ids_by(db: AsyncSession, column, values: List[Optional[str]]) -> dict:
+    """
+    Map external IDs (google_books_id, openlibrary_id) to library book IDs
+    using a single IN query instead of one lookup per search result
+    """
+    values = [value for value in values if value]
+    if not values:
+        return {}
+
+    rows = (await db.execute(
+        select(column, Book.id).where(column.in_(values))
+    )).all()
+
+    return {value: book_id for value, book_id in rows}
+
+
+async def _library_ids_by_title(db: AsyncSession, titles: List[str]) -> dict:
+    """
+    Map lowercased title prefixes (first 40 chars) to library book IDs
+    using a single OR-of-ILIKE query for the whole result batch
+    """
+    prefixes = {title[:40].lower() for title in titles if title}
+    if not prefixes:
+        return {}
+
+    rows = (await db.execute(
+        select(Book.id, Book.title).where(
+            or_(*[Book.title.ilike(f"%{prefix}%") for prefix in prefixes])
+        )
+    )).all()
+
+    library_ids = {}
+    for prefix in prefixes:
+        for book_id, book_title in rows:
+            if prefix in (book_title or '').lower():
+                library_ids[prefix] = book_id
+                break
+
+    return library_ids
+
+
+async def _unique_book_slug(db: AsyncSession, base_slug: str, exclude_book_id: Optional[int] = None) -> str:
+    """First free slug among base_slug, base_slug-1, base_slug-2... (single query)"""
+    query = select(Book.slug).where(Book.slug.startswith(base_slug, autoescape=True))
+    if exclude_book_id is not None:
+        query = query.where(Book.id != exclude_book_id)
+    taken = set((await db.scalars(query)).all())
+
+    slug = base_slug
+    counter = 1
+    while slug in taken:
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    return slug
+
+
+@dataclass
+class _ScraperHit:
+    """Download links found by one scraper for a book"""
+    scraper_name: str
+    page_url: str
+    best_url: str
+    backup_url: Optional[str] = None
+
+
+async def _resolve_result(scraper, search_result: dict) -> Optional[_ScraperHit]:
+    """Resolve a search result's download links, None if nothing downloadable"""
+    result = await scraper.get_download_links(search_result['url'])
+    if not (result.success and result.best_link):
+        return None
+
+    return _ScraperHit(
+        scraper_name=scraper.name,
+        page_url=search_result['url'],
+        best_url=result.best_link.url,
+        backup_url=result.backup_link.url if result.backup_link else None
+    )
+
+
+async def _probe_scraper(scraper, title: str) -> Optional[_ScraperHit]:
+    """
+    Search one scraper for a title and resolve the first result's links
+    Returns None when nothing downloadable is found
+
+    Page 2 is only searched when the first result has nothing downloadable.
+    """
+    # Search for book
+    search_results = await scraper.search(title, page=1)
+    if not search_results:
+        return None
+
+    # Take first result
+    first_result = search_results[0]
+
+    hit = await _resolve_result(scraper, first_result)
+    if hit:
+        return hit
+
+    fallback_results = await scraper.search(title, page=2)
+
+    # Fall back to the first new result from page 2
+    fallback = next(
+        (r for r in fallback_results if r['url'] != first_result['url']),
+        None
+    )
+    if not fallback:
+        return None
+
+    return await _resolve_result(scraper, fallback)
+
+
 async def _search_scrapers_for_book(book_id: int, title: str):
     """
     Search all scrapers for a book and create chapters
     Background task
     """
-    from app.database import SessionLocal
-    db = SessionLocal()
-
-    try:
-        book = db.query(Book).filter(Book.id == book_id).first()
+    async with AsyncSessionLocal() as db:
+        book = await db.get(Book, book_id)
         if not book:
             return
 
         scrapers = [
-            LectulandiaScraper()
+            get_lectulandia_scraper()
         ]
 
-        for scraper in scrapers:
-            try:
-                # Search for book
-                search_results = await scraper.search(title, page=1)
-
-                if search_results:
-                    # Take first result
-                    first_result = search_results[0]
-
-                    # Get download links
-                    result = await scraper.get_download_links(first_result['url'])
-
-                    if result.success and result.best_link:
-                        # Update source URLs
-                        if not book.source_urls:
-                            book.source_urls = {}
-                        book.source_urls[scraper.name] = first_result['url']
-
-                        if not book.preferred_source:
-                            book.preferred_source = scraper.name
-
-                        # Create chapter if doesn't exist
-                        existing_chapter = db.query(BookChapter).filter(
-                            BookChapter.book_id == book_id,
-                            BookChapter.source == scraper.name
-                        ).first()
-
-                        if not existing_chapter:
-                            chapter = BookChapter(
-                                book_id=book_id,
-                                number=1,
-                                title=book.title,
-                                download_url=result.best_link.url,
-                                backup_url=result.backup_link.url if result.backup_link else None,
-                                source=scraper.name,
-                                status="pending"
-                            )
-                            db.add(chapter)
-
-                        db.commit()
+        # Query all scrapers concurrently
+        hits = await asyncio.gather(
+            *[_probe_scraper(scraper, title) for scraper in scrapers],
+            return_exceptions=True
+        )
 
-            except Exception as e:
-                logger.error(f"Error searching {scraper.name} for book {book_id}: {e}")
+        found = []
+        for scraper, hit in zip(scrapers, hits):
+            if isinstance(hit, Exception):
+                logger.error(f"Error searching {scraper.name} for book {book_id}: {hit}")
                 continue
 
+            if hit is not None:
+                found.append(hit)
+
+        if not found:
+            return
+
+        # Check which sources already have a chapter (single query)
+        existing_sources = set((await db.scalars(
+            select(BookChapter.source).where(
+                BookChapter.book_id == book_id,
+                BookChapter.source.in_([hit.scraper_name for hit in found])
+            )
+        )).all())
+
+        if book.source_urls is None:
+            book.source_urls = {}
+
+        new_chapters = []
+        for hit in found:
+            book.source_urls[hit.scraper_name] = hit.page_url
+
+            if not book.preferred_source:
+                book.preferred_source = hit.scraper_name
+
+            if hit.scraper_name not in existing_sources:
+                new_chapters.append({
+                    "book_id": book_id,
+                    "number": 1,
+                    "title": book.title,
+                    "download_url": hit.best_url,
+                    "backup_url": hit.backup_url,
+                    "source": hit.scraper_name,
+                    "status": "pending"
+                })
+
+        # In-place changes to the JSON column aren't tracked automatically
+        flag_modified(book, "source_urls")
+
+        if new_chapters:
+            await db.execute(insert(BookChapter), new_chapters)
+
+        # Apply all scraper results in one transaction
+        await db.commit()
+
+
+async def _scrape_book_from_url(
+    book_id: int,
+    scraper_name: str,
+    source_url: str,
+    google_books_id: Optional[str] = None
+):
+    """
+    Scrape a book page and fill in a placeholder book created by /from-url
+    Background task
+    """
+    scrapers = {
+        'lectulandia': get_lectulandia_scraper()
+    }
+
+    async with AsyncSessionLocal() as db:
+        book = await db.get(Book, book_id)
+        if not book:
+            return
+
+        try:
+            # Scrape book page
+            result = await scrapers[scraper_name].get_download_links(source_url)
+
+            if not result.success:
+                logger.error(f"Scraping {source_url} failed: {result.error}")
+                book.scrape_status = "scrape_failed"
+                book.scrape_error = result.error or "Scraping failed"
+                await db.commit()
+                return
+
+            book.title = result.title
+            book.slug = await _unique_book_slug(db, cached_slugify(result.title), exclude_book_id=book.id)
+            book.description = result.description
+            book.cover_image = result.cover_image
+
+            # Try to enrich with Google Books metadata if provided
+            if google_books_id:
+                google_books = get_google_books_service()
+                metadata = await google_books.get_book_by_id(google_books_id)
+                if metadata:
+                    book.google_books_id = metadata['google_books_id']
+                    book.authors = metadata.get('authors', [])
+                    book.publisher = metadata.get('publisher')
+                    book.published_date = metadata.get('published_date')
+                    book.isbn_10 = metadata.get('isbn_10')
+                    book.isbn_13 = metadata.get('isbn_13')
+                    book.categories = metadata.get('categories', [])
+                    book.average_rating = metadata.get('average_rating')
+
+            # Create chapter entry for download
+            if result.best_link:
+                db.add(BookChapter(
+                    book_id=book.id,
+                    number=1,
+                    title=result.title,
+                    download_url=result.best_link.url,
+                    backup_url=result.backup_link.url if result.backup_link else None,
+                    source=scraper_name,
+                    status="pending"
+                ))
+
+            book.scrape_status = None
+            await db.commit()
+            logger.info(f"Scraped book {book_id}: {book.title}")
+
+        except Exception as e:
+            logger.error(f"Error scraping {source_url} for book {book_id}: {e}")
+            await db.rollback()
+            # Mark the placeholder so GET /books/{id} reports the failure
+            try:
+                await db.execute(
+                    update(Book)
+                    .where(Book.id == book_id)
+                    .values(scrape_status="scrape_failed", scrape_error=str(e))
+                )
+                await db.commit()
+            except Exception as e:
+                logger.error(f"Could not mark book {book_id} as failed: {e}")
+                await db.rollback()
+
+
+async def _find_download_control(page, selectors: List[str]):
+    """
+    Find the first visible element matching any selector in one round-trip
+
+    Returns:
+        Element handle or None
+    """
+    handle = await page.evaluate_handle(_FIND_DOWNLOAD_CONTROL_JS, selectors)
+    element = handle.as_element()
+    if element is None:
+        await handle.dispose()
+    return element
+
+
+async def _race_selectors(page, selectors: List[str], timeout: int = 5000):
+    """
+    Wait for the first of several selectors to become visible
+
+    All selectors are probed concurrently, so the wait is bounded by the
+    fastest match instead of the sum of every probe.
+
+    Returns:
+        Matching element handle or None if none showed up within timeout
+    """
+    tasks = {
+        asyncio.create_task(page.wait_for_selector(selector, state='visible', timeout=timeout)): selector
+        for selector in selectors
+    }
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                # Timeouts and invalid selectors just drop out of the race
+                if task.exception() is None and task.result():
+                    logger.info(f"Found download button with selector: {tasks[task]}")
+                    return task.result()
+        return None
     finally:
-        db.close()
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _match_intermediate_host(hostname: str) -> Optional[str]:
+    """
+    Find the HOST_DISPATCH entry for a hostname, including its subdomains
+
+    Walks the hostname's parent domains (cdn.krakenfiles.com, krakenfiles.com),
+    so the cost depends on the number of labels, not on the number of hosts.
+    """
+    labels = hostname.lower().rstrip('.').split('.')
+    for i in range(len(labels) - 1):
+        candidate = '.'.join(labels[i:])
+        if candidate in HOST_DISPATCH:
+            return candidate
+    return None
+
+
+async def _goto_limited(page, url: str, timeout: int = 30000):
+    """Navigate a page while holding a slot for the target host"""
+    async with HOST_LIMITER.limit(url):
+        response = await page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+        if response and response.status == 429:
+            HOST_LIMITER.report_throttled(
+                HOST_LIMITER.host_of(url), response.headers.get('retry-after')
+            )
+        return response
+
+
+async def _move_download(download, destination: Path):
+    """
+    Move a finished Playwright download into place
+
+    Playwright already wrote the file to its artifacts dir, so a rename
+    avoids copying it again; copy only when crossing filesystems.
+    """
+    source = await download.path()
+
+    def _move():
+        try:
+            os.replace(source, destination)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.copyfile(source, destination)
+
+    await asyncio.to_thread(_move)
+
+
+def _file_size(path: Path) -> Optional[int]:
+    """Size of a file in bytes, or None if it doesn't exist"""
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return None
 
 
 async def _download_book_chapter(chapter_id: int):
@@ -732,19 +1129,18 @@ async def _download_book_chapter(chapter_id: int):
     Download a book chapter (EPUB file)
     Background task
     """
-    from app.database import SessionLocal
     from app.services.book_downloader import BookDownloader
-    import os
 
-    db = SessionLocal()
+    db = AsyncSessionLocal()
+    chapter = None
 
     try:
-        chapter = db.query(BookChapter).filter(BookChapter.id == chapter_id).first()
+        chapter = await db.get(BookChapter, chapter_id)
         if not chapter:
             logger.error(f"Chapter {chapter_id} not found")
             return
 
-        book = db.query(Book).filter(Book.id == chapter.book_id).first()
+        book = await db.get(Book, chapter.book_id)
         if not book:
             logger.error(f"Book {chapter.book_id} not found")
             return
@@ -753,11 +1149,16 @@ async def _download_book_chapter(chapter_id: int):
         logger.info(f"Download URL: {chapter.download_url}")
 
         # Check if URL is from an intermediate host that needs resolving
-        needs_resolving = any(host in chapter.download_url.lower()
-                            for host in ['antupload.com', 'beeupload', 'fireload', 'krakenfiles.com/view'])
+        parsed_url = urlparse(chapter.download_url)
+        host = _match_intermediate_host(parsed_url.hostname or '')
+        selectors, host_tag = HOST_DISPATCH.get(host, (GENERIC_SELECTORS, 'generic'))
+        # Krakenfiles only needs resolving from its /view/ pages
+        needs_resolving = host is not None and (
+            host_tag != 'kraken' or parsed_url.path.startswith('/view')
+        )
 
         # Sanitize filename
-        safe_title = "".join(c for c in book.title if c.isalnum() or c in (' ', '-', '_')).strip()
+        safe_title = _UNSAFE_FILENAME_CHARS.sub('', book.title).strip()
         filename = f"{safe_title}.epub"
 
         # If the URL needs resolving with Playwright, use Playwright to download directly
@@ -767,88 +1168,59 @@ async def _download_book_chapter(chapter_id: int):
             from pathlib import Path
 
             playwright_scraper = await get_playwright_scraper()
-            page = await playwright_scraper._create_page()
+            page = await playwright_scraper.acquire_page()
 
             try:
                 # Navigate to the intermediate host page
                 logger.info(f"Navigating to {chapter.download_url}")
-                await page.goto(chapter.download_url, wait_until='domcontentloaded', timeout=30000)
+                await _goto_limited(page, chapter.download_url)
                 await asyncio.sleep(3)
 
                 # Find the download button - different selectors for different hosts
                 download_btn = None
 
-                # Krakenfiles selectors
-                if 'krakenfiles.com' in chapter.download_url.lower():
+                if host_tag == 'kraken':
                     logger.info("Looking for krakenfiles download button...")
-                    # Try multiple selectors for krakenfiles
-                    selectors = [
-                        'button.btn-primary:has-text("Download")',
-                        'button:has-text("Download now")',
-                        'a:has-text("Download now")',
-                        'button.btn-primary',
-                        'a.download-url',
-                        'a[href*="krakenfiles.com/file/"]',
-                        'button:has-text("Free Download")',
-                        'a:has-text("Free Download")',
-                        'a.btn-primary',
-                        '.download-button',
-                        'a[href*="/file/"]'
-                    ]
-                    for selector in selectors:
-                        try:
-                            btn = await page.query_selector(selector)
-                            if btn and await btn.is_visible():
-                                download_btn = btn
-                                logger.info(f"Found download button with selector: {selector}")
-                                break
-                        except:
-                            continue
-
-                # Antupload selectors (already working)
-                elif 'antupload.com' in chapter.download_url.lower():
-                    logger.info("Looking for antupload download button...")
-                    download_btn = await page.query_selector('#downloadB')
-
-                # Generic selectors for other hosts
+                    # Already rendered controls are found in one call; otherwise wait for them
+                    download_btn = (
+                        await _find_download_control(page, selectors)
+                        or await _race_selectors(page, selectors)
+                    )
+
                 else:
-                    logger.info("Looking for generic download button...")
-                    download_btn = await page.query_selector('a.btn-download, a[href*="download"], button:has-text("Download")')
+                    logger.info(f"Looking for {host_tag} download button...")
+                    download_btn = await page.query_selector(selectors[0])
 
                 if not download_btn:
                     # Take a screenshot and dump HTML for debugging
                     logger.error("Download button not found. Taking screenshot and logging HTML...")
                     await page.screenshot(path='/downloads/books/debug_screenshot.png')
 
-                    # Get page HTML for debugging
-                    html_content = await page.content()
-                    logger.error(f"Page HTML length: {len(html_content)}")
-
-                    # Log all links and buttons on the page
-                    all_links = await page.query_selector_all('a')
-                    all_buttons = await page.query_selector_all('button')
+                    # Only the length crosses the bridge unless debugging
+                    html_length = await page.evaluate('() => document.documentElement.outerHTML.length')
+                    logger.error(f"Page HTML length: {html_length}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        html_content = await page.content()
+                        await asyncio.to_thread(
+                            Path('/downloads/books/debug_page.html').write_text, html_content, encoding='utf-8'
+                        )
+                        logger.debug("Page HTML saved to /downloads/books/debug_page.html")
+
+                    # Log all links and buttons on the page (one round-trip)
+                    elements = await page.evaluate(_COLLECT_ELEMENTS_JS)
+                    all_links, all_buttons = elements['links'], elements['buttons']
                     logger.error(f"Found {len(all_links)} links and {len(all_buttons)} buttons on page")
 
                     # Check for links with "download" or "free" in href or text
                     for i, link in enumerate(all_links):
-                        try:
-                            href = await link.get_attribute('href')
-                            text = await link.inner_text()
-                            classes = await link.get_attribute('class')
-
-                            if href and ('download' in href.lower() or 'file' in href.lower() or 'free' in (text or '').lower()):
-                                logger.error(f"Potential download link {i+1}: href={href}, text={text[:50] if text else 'N/A'}, class={classes}")
-                        except:
-                            pass
+                        href, text = link['href'], link['text']
+                        if href and ('download' in href.lower() or 'file' in href.lower() or 'free' in (text or '').lower()):
+                            logger.error(f"Potential download link {i+1}: href={href}, text={text[:50] if text else 'N/A'}, class={link['cls']}")
 
                     # Check buttons
                     for i, btn in enumerate(all_buttons[:5]):
-                        try:
-                            text = await btn.inner_text()
-                            classes = await btn.get_attribute('class')
-                            logger.error(f"Button {i+1}: text={text[:50] if text else 'N/A'}, class={classes}")
-                        except:
-                            pass
+                        text = btn['text']
+                        logger.error(f"Button {i+1}: text={text[:50] if text else 'N/A'}, class={btn['cls']}")
 
                     raise Exception("Download button not found on page")
 
@@ -856,7 +1228,7 @@ async def _download_book_chapter(chapter_id: int):
 
                 # Set up download path
                 download_dir = Path("/downloads/books")
-                download_dir.mkdir(parents=True, exist_ok=True)
+                await asyncio.to_thread(download_dir.mkdir, parents=True, exist_ok=True)
                 download_path = download_dir / filename
 
                 # Try to trigger the download
@@ -870,7 +1242,7 @@ async def _download_book_chapter(chapter_id: int):
                     logger.info(f"✅ Download started: {download.suggested_filename}")
 
                     # Save the file
-                    await download.save_as(str(download_path))
+                    await _move_download(download, download_path)
                     logger.info(f"✅ Downloaded with Playwright: {filename}")
 
                     result_path = download_path
@@ -888,26 +1260,23 @@ async def _download_book_chapter(chapter_id: int):
 
                     # Look for download links that might have appeared after the click
                     logger.info("Looking for download links on the page...")
-                    all_links = await page.query_selector_all('a')
+                    all_links = (await page.evaluate(_COLLECT_ELEMENTS_JS))['links']
 
                     direct_link = None
                     for link in all_links:
-                        try:
-                            href = await link.get_attribute('href')
-                            text = await link.inner_text() if await link.is_visible() else None
-
-                            if href and (
-                                'cdn' in href.lower() or
-                                'files' in href.lower() or
-                                'file/' in href.lower() or
-                                href.endswith('.epub') or
-                                (text and 'download' in text.lower() and 'Download now' not in text)
-                            ):
-                                logger.info(f"Found potential direct link: text='{text}', href={href[:80]}")
-                                direct_link = href
-                                break
-                        except:
-                            continue
+                        href = link['href']
+                        text = link['text'] if link['visible'] else None
+
+                        if href and (
+                            'cdn' in href.lower() or
+                            'files' in href.lower() or
+                            'file/' in href.lower() or
+                            href.endswith('.epub') or
+                            (text and 'download' in text.lower() and 'Download now' not in text)
+                        ):
+                            logger.info(f"Found potential direct link: text='{text}', href={href[:80]}")
+                            direct_link = href
+                            break
 
                     if direct_link:
                         logger.info(f"Trying to download from: {direct_link}")
@@ -915,7 +1284,7 @@ async def _download_book_chapter(chapter_id: int):
                         # Navigate to the download link and wait for actual download
                         try:
                             logger.info("Navigating to download link with Playwright...")
-                            await page.goto(direct_link, wait_until='domcontentloaded', timeout=30000)
+                            await _goto_limited(page, direct_link)
                             await asyncio.sleep(2)
 
                             # Try to trigger download from this page
@@ -924,8 +1293,8 @@ async def _download_book_chapter(chapter_id: int):
                                 # Sometimes download starts automatically, sometimes need to click
                                 # Try to find and click a download button if present
                                 try:
-                                    final_download_btn = await page.query_selector('button:has-text("Download"), a:has-text("Download"), button.download, a.download')
-                                    if final_download_btn and await final_download_btn.is_visible():
+                                    final_download_btn = await _find_download_control(page, FINAL_DOWNLOAD_SELECTORS)
+                                    if final_download_btn:
                                         logger.info("Found final download button, clicking...")
                                         await final_download_btn.click()
                                     else:
@@ -938,7 +1307,7 @@ async def _download_book_chapter(chapter_id: int):
                             logger.info(f"✅ Download started: {download.suggested_filename}")
 
                             # Save the file
-                            await download.save_as(str(download_path))
+                            await _move_download(download, download_path)
                             logger.info(f"✅ Downloaded with Playwright: {filename}")
                             result_path = download_path
 
@@ -949,21 +1318,17 @@ async def _download_book_chapter(chapter_id: int):
                         # No direct link found - log all links for debugging
                         logger.error("No direct download link found. Logging all links:")
                         for i, link in enumerate(all_links[:15]):
-                            try:
-                                href = await link.get_attribute('href')
-                                text = await link.inner_text() if await link.is_visible() else None
-                                logger.error(f"Link {i+1}: text='{text[:30] if text else 'hidden'}', href={href[:60] if href else 'no href'}")
-                            except:
-                                pass
+                            href = link['href']
+                            text = link['text'] if link['visible'] else None
+                            logger.error(f"Link {i+1}: text='{text[:30] if text else 'hidden'}', href={href[:60] if href else 'no href'}")
                         raise Exception("Download button clicked but no download link found on page")
 
             except Exception as e:
                 logger.error(f"Playwright download failed: {e}")
-                await page.close()
                 raise
 
             finally:
-                await page.close()
+                await playwright_scraper.release_page(page)
 
         else:
             # For direct links, use the normal downloader
@@ -977,18 +1342,22 @@ async def _download_book_chapter(chapter_id: int):
             backup_urls = [chapter.backup_url] if chapter.backup_url else []
 
             # Download book
-            result_path = await downloader.download_book(
-                url=chapter.download_url,
-                filename=filename,
-                on_progress=on_progress,
-                backup_urls=backup_urls
-            )
+            async with HOST_LIMITER.limit(chapter.download_url):
+                result_path = await downloader.download_book(
+                    url=chapter.download_url,
+                    filename=filename,
+                    on_progress=on_progress,
+                    backup_urls=backup_urls
+                )
+
+        # Stat off the event loop; a missing file means the download failed
+        file_size = await asyncio.to_thread(_file_size, result_path) if result_path else None
 
-        if result_path and result_path.exists():
+        if file_size is not None:
             # Update chapter status
             chapter.status = "downloaded"
             chapter.file_path = str(result_path)
-            chapter.file_size = os.path.getsize(result_path)
+            chapter.file_size = file_size
             chapter.downloaded_at = datetime.now()
             logger.info(f"✅ Downloaded: {book.title} ({chapter.file_size / (1024*1024):.2f} MB)")
         else:
@@ -996,13 +1365,13 @@ async def _download_book_chapter(chapter_id: int):
             chapter.error_message = "Download failed"
             logger.error(f"❌ Download failed for: {book.title}")
 
-        db.commit()
+        await db.commit()
 
     except Exception as e:
         logger.error(f"Error downloading chapter {chapter_id}: {e}")
         if chapter:
             chapter.status = "error"
             chapter.error_message = str(e)
-            db.commit()
+            await db.commit()
     finally:
-        db.close()
+        await db.close()
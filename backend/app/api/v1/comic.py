@@ -3,15 +3,22 @@ Comic API Endpoints
 American comics library management with ComicVine integration
 """
 
+import base64
+import json
+import time
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, func
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+from sqlalchemy import or_, and_, func, tuple_, select, delete, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Dict, List, Optional
 from pydantic import BaseModel
-from app.database import get_db
+from app.database import get_async_db, AsyncSessionLocal
 from app.models.comic import Comic, ComicIssue
 from app.services.comicvine import get_comicvine_service
+from app.utils.cache import TTLCache
 import logging
 from slugify import slugify
 
@@ -97,43 +104,172 @@ class ComicStats(BaseModel):
     downloaded_issues: int
 
 
+# Columns each response schema actually reads (used with load_only)
+COMIC_RESPONSE_COLUMNS = (
+    Comic.id, Comic.title, Comic.slug, Comic.comicvine_id, Comic.description,
+    Comic.cover_image, Comic.publisher, Comic.start_year, Comic.count_of_issues,
+    Comic.writers, Comic.artists, Comic.comicvine_url, Comic.monitored,
+    Comic.created_at, Comic.total_issues, Comic.downloaded_issues,
+)
+ISSUE_RESPONSE_COLUMNS = (
+    ComicIssue.id, ComicIssue.comic_id, ComicIssue.issue_number, ComicIssue.title,
+    ComicIssue.cover_image, ComicIssue.release_date, ComicIssue.status, ComicIssue.file_path,
+)
+
+
+def _construct_from_row(model, row):
+    """
+    Build a response model from an ORM row without validation
+
+    Columns were already typed by SQLAlchemy, so list endpoints skip the
+    per-field validators; every model field must be loaded on the row.
+    """
+    return model.model_construct(**{name: getattr(row, name) for name in model.model_fields})
+
+
+# ============================================================================
+# KEYSET PAGINATION
+# ============================================================================
+
+def _encode_cursor(sort_value, comic_id: int) -> str:
+    """Opaque cursor pointing after a (sort value, id) pair"""
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, comic_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str, sort: str):
+    """Return (sort value, id) from a cursor, raising 400 if malformed"""
+    try:
+        sort_value, comic_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if sort == "created_at" and sort_value is not None:
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, int(comic_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after_cursor(sort: str, sort_value, comic_id: int, descending: bool):
+    """
+    Filter for rows strictly after the cursor in (sort column, id) order
+
+    NULL sort values come last ascending and first descending (Postgres default).
+    """
+    column = getattr(Comic, sort)
+
+    if sort_value is None:
+        if descending:
+            return or_(column.isnot(None), and_(column.is_(None), Comic.id < comic_id))
+        return and_(column.is_(None), Comic.id > comic_id)
+
+    if descending:
+        return tuple_(column, Comic.id) < tuple_(sort_value, comic_id)
+
+    after = tuple_(column, Comic.id) > tuple_(sort_value, comic_id)
+    if Comic.__table__.c[sort].nullable:
+        after = or_(after, column.is_(None))
+    return after
+
+
+# ============================================================================
+# STATS CACHE
+# ============================================================================
+
+# Library stats change slowly; cleared whenever comics or issues change
+STATS_CACHE_TTL = 30
+
+_stats_cache = TTLCache(ttl=STATS_CACHE_TTL, maxsize=1)
+
+
+def _invalidate_stats():
+    """Drop cached library stats after a mutation"""
+    _stats_cache.clear()
+
+
+# ============================================================================
+# LIBRARY INDEX - comicvine_id -> library id
+# ============================================================================
+
+# Reloaded periodically so changes made by other workers show up
+LIBRARY_INDEX_TTL = 60
+
+_library_index: Dict[int, int] = {}
+_library_index_loaded_at = 0.0
+
+
+async def _get_library_index(db: AsyncSession) -> Dict[int, int]:
+    """Map of ComicVine ID to library comic ID, reloaded every LIBRARY_INDEX_TTL seconds"""
+    global _library_index, _library_index_loaded_at
+
+    if time.monotonic() - _library_index_loaded_at > LIBRARY_INDEX_TTL:
+        rows = await db.execute(
+            select(Comic.id, Comic.comicvine_id).where(Comic.comicvine_id.isnot(None))
+        )
+        _library_index = {cv_id: library_id for library_id, cv_id in rows}
+        _library_index_loaded_at = time.monotonic()
+
+    return _library_index
+
+
 # ============================================================================
 # SEARCH - ComicVine Integration
 # ============================================================================
 
-@router.get("/search", response_model=ComicSearchResponse)
+def _truncate(text: Optional[str], length: int = 300) -> Optional[str]:
+    """Cut long descriptions for search listings"""
+    if text and len(text) > length:
+        return text[:length] + '...'
+    return text
+
+
+@router.get("/search", response_model=ComicSearchResponse, response_class=ORJSONResponse)
 async def search_comics(
+    response: Response,
     q: str = Query(..., min_length=2, description="Search query"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Search comics on ComicVine
     """
     comicvine = get_comicvine_service()
+    cached = comicvine.search_volumes.is_cached(q, page=page, per_page=limit)
+    response.headers['X-Cache'] = 'HIT' if cached else 'MISS'
     search_result = await comicvine.search_volumes(q, page=page, per_page=limit)
     
     if search_result.get('error'):
         raise HTTPException(status_code=503, detail=search_result['error'])
     
-    results = []
-    for item in search_result.get('results', []):
-        # Check if in library
-        in_library = db.query(Comic).filter(Comic.comicvine_id == item['comicvine_id']).first()
-        
-        results.append(ComicSearchResult(
-            comicvine_id=item['comicvine_id'],
-            title=item['title'],
-            description=item.get('description', '')[:300] + '...' if item.get('description') and len(item.get('description', '')) > 300 else item.get('description'),
-            cover_image=item.get('cover_image'),
-            publisher=item.get('publisher'),
-            start_year=item.get('start_year'),
-            count_of_issues=item.get('count_of_issues'),
-            comicvine_url=item.get('comicvine_url'),
-            in_library=bool(in_library),
-            library_id=in_library.id if in_library else None
-        ))
+    items = search_result.get('results', [])
+    
+    # Check which results are in library (single query)
+    comicvine_ids = [item.comicvine_id for item in items]
+    owned = {
+        cv_id: library_id
+        for library_id, cv_id in await db.execute(
+            select(Comic.id, Comic.comicvine_id).where(Comic.comicvine_id.in_(comicvine_ids))
+        )
+    } if comicvine_ids else {}
+    
+    # Items are already typed, so skip validation when building the models
+    construct = ComicSearchResult.model_construct
+    results = [
+        construct(
+            comicvine_id=item.comicvine_id,
+            title=item.title,
+            description=_truncate(item.description),
+            cover_image=item.cover_image,
+            publisher=item.publisher,
+            start_year=item.start_year,
+            count_of_issues=item.count_of_issues,
+            comicvine_url=item.comicvine_url,
+            in_library=item.comicvine_id in owned,
+            library_id=owned.get(item.comicvine_id)
+        )
+        for item in items
+    ]
     
     return ComicSearchResponse(
         results=results,
@@ -143,27 +279,30 @@ async def search_comics(
     )
 
 
-@router.get("/comicvine/{comicvine_id}")
+@router.get("/comicvine/{comicvine_id}", response_class=ORJSONResponse)
 async def get_comicvine_details(
     comicvine_id: int,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get detailed comic info from ComicVine (preview before adding)
     """
     comicvine = get_comicvine_service()
+    cached = comicvine.get_volume.is_cached(comicvine_id)
+    response.headers['X-Cache'] = 'HIT' if cached else 'MISS'
     details = await comicvine.get_volume(comicvine_id)
     
     if not details:
         raise HTTPException(status_code=404, detail="Comic not found on ComicVine")
     
     # Check if in library
-    in_library = db.query(Comic).filter(Comic.comicvine_id == comicvine_id).first()
+    library_id = (await _get_library_index(db)).get(comicvine_id)
     
     return {
         **details,
-        'in_library': bool(in_library),
-        'library_id': in_library.id if in_library else None
+        'in_library': library_id is not None,
+        'library_id': library_id
     }
 
 
@@ -173,80 +312,87 @@ async def get_comicvine_details(
 
 @router.get("/", response_model=List[ComicResponse])
 async def get_library(
+    response: Response,
     monitored: Optional[bool] = None,
     publisher: Optional[str] = None,
     search: Optional[str] = None,
     sort: str = Query("title", regex="^(title|created_at|start_year)$"),
     order: str = Query("asc", regex="^(asc|desc)$"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     page: int = Query(1, ge=1),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db)
+    include_total: bool = Query(False, description="Return the filtered total in X-Total-Count"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get comics library with filters
+
+    Paginate with `cursor` (keyset, constant cost at any depth); the cursor
+    for the next page is returned in the X-Next-Cursor header. `page` is
+    still accepted for offset pagination.
     """
-    query = db.query(Comic)
+    # Issue counters are stored on the comic row, so no join or aggregate is needed
+    query = select(Comic).options(load_only(*COMIC_RESPONSE_COLUMNS))
     
     # Filters
     if monitored is not None:
-        query = query.filter(Comic.monitored == monitored)
+        query = query.where(Comic.monitored == monitored)
     
     if publisher:
-        query = query.filter(Comic.publisher.ilike(f"%{publisher}%"))
+        query = query.where(Comic.publisher.ilike(f"%{publisher}%"))
     
     if search:
-        query = query.filter(
+        query = query.where(
             or_(
                 Comic.title.ilike(f"%{search}%"),
                 Comic.publisher.ilike(f"%{search}%")
             )
         )
     
-    # Sorting
-    sort_column = getattr(Comic, sort, Comic.title)
-    if order == "desc":
-        sort_column = sort_column.desc()
-    query = query.order_by(sort_column)
+    # Sorting (id breaks ties so the keyset order is total)
+    descending = order == "desc"
+    sort_column = getattr(Comic, sort)
+    if descending:
+        query = query.order_by(sort_column.desc(), Comic.id.desc())
+    else:
+        query = query.order_by(sort_column, Comic.id)
+    
+    # Counting is a second full pass over the filtered rows, so it's opt-in
+    if include_total:
+        total = await db.scalar(
+            select(func.count()).select_from(query.order_by(None).subquery())
+        )
+        response.headers["X-Total-Count"] = str(total)
     
     # Pagination
-    total = query.count()
-    comics = query.offset((page - 1) * limit).limit(limit).all()
-    
-    # Build response
-    result = []
-    for comic in comics:
-        result.append(ComicResponse(
-            id=comic.id,
-            title=comic.title,
-            slug=comic.slug,
-            comicvine_id=comic.comicvine_id,
-            description=comic.description,
-            cover_image=comic.cover_image,
-            publisher=comic.publisher,
-            start_year=comic.start_year,
-            count_of_issues=comic.count_of_issues,
-            writers=comic.writers,
-            artists=comic.artists,
-            comicvine_url=comic.comicvine_url,
-            monitored=comic.monitored,
-            total_issues=comic.total_issues,
-            downloaded_issues=comic.downloaded_issues
-        ))
+    if cursor:
+        sort_value, last_id = _decode_cursor(cursor, sort)
+        query = query.where(_after_cursor(sort, sort_value, last_id, descending))
+    else:
+        query = query.offset((page - 1) * limit)
     
-    return result
+    comics = (await db.scalars(query.limit(limit))).all()
+    
+    if len(comics) == limit:
+        last = comics[-1]
+        response.headers["X-Next-Cursor"] = _encode_cursor(getattr(last, sort), last.id)
+    
+    return [_construct_from_row(ComicResponse, comic) for comic in comics]
 
 
 @router.post("/", response_model=ComicResponse)
 async def add_comic(
     data: ComicCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add comic to library from ComicVine
     """
     # Check if already exists
-    existing = db.query(Comic).filter(Comic.comicvine_id == data.comicvine_id).first()
+    existing = await db.scalar(
+        select(exists().where(Comic.comicvine_id == data.comicvine_id))
+    )
     if existing:
         raise HTTPException(status_code=400, detail="Comic already in library")
     
@@ -280,67 +426,68 @@ async def add_comic(
     )
     
     db.add(comic)
-    db.commit()
-    db.refresh(comic)
+    await db.commit()
+    await db.refresh(comic)
+    _library_index[comic.comicvine_id] = comic.id
+    _invalidate_stats()
     
     # Fetch issues in background
     background_tasks.add_task(fetch_comic_issues, comic.id, data.comicvine_id)
     
     logger.info(f"Added comic to library: {comic.title}")
     
-    return ComicResponse(
-        id=comic.id,
-        title=comic.title,
-        slug=comic.slug,
-        comicvine_id=comic.comicvine_id,
-        description=comic.description,
-        cover_image=comic.cover_image,
-        publisher=comic.publisher,
-        start_year=comic.start_year,
-        count_of_issues=comic.count_of_issues,
-        writers=comic.writers,
-        artists=comic.artists,
-        comicvine_url=comic.comicvine_url,
-        monitored=comic.monitored,
-        total_issues=0,
-        downloaded_issues=0
-    )
+    return ComicResponse.model_validate(comic)
 
 
 @router.get("/stats", response_model=ComicStats)
-async def get_stats(db: Session = Depends(get_db)):
+async def get_stats(db: AsyncSession = Depends(get_async_db)):
     """
     Get comic library statistics
     """
-    total_comics = db.query(func.count(Comic.id)).scalar()
-    monitored_comics = db.query(func.count(Comic.id)).filter(Comic.monitored == True).scalar()
-    total_issues = db.query(func.count(ComicIssue.id)).scalar()
-    downloaded_issues = db.query(func.count(ComicIssue.id)).filter(ComicIssue.status == "downloaded").scalar()
-    
-    return ComicStats(
-        total_comics=total_comics or 0,
-        monitored_comics=monitored_comics or 0,
-        total_issues=total_issues or 0,
-        downloaded_issues=downloaded_issues or 0
+    hit, cached = _stats_cache.get("stats")
+    if hit:
+        return cached
+    
+    # Issue totals come from the per-comic counters: one pass over comics only
+    stats = (await db.execute(
+        select(
+            func.count(Comic.id).label("total_comics"),
+            func.count(Comic.id).filter(Comic.monitored == True).label("monitored_comics"),
+            func.coalesce(func.sum(Comic.total_issues), 0).label("total_issues"),
+            func.coalesce(func.sum(Comic.downloaded_issues), 0).label("downloaded_issues")
+        )
+    )).one()
+    
+    result = ComicStats(
+        total_comics=stats.total_comics,
+        monitored_comics=stats.monitored_comics,
+        total_issues=stats.total_issues,
+        downloaded_issues=stats.downloaded_issues
     )
+    _stats_cache.set("stats", result)
+    return result
 
 
 @router.get("/{comic_id}", response_model=ComicDetailResponse)
 async def get_comic(
     comic_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get comic details with issues
     """
-    comic = db.query(Comic).filter(Comic.id == comic_id).first()
+    comic = await db.get(Comic, comic_id)
     if not comic:
         raise HTTPException(status_code=404, detail="Comic not found")
     
     # Get issues
-    issues = db.query(ComicIssue).filter(
-        ComicIssue.comic_id == comic_id
-    ).order_by(ComicIssue.issue_number).all()
+    issues = (await db.scalars(
+        select(ComicIssue).options(
+            load_only(*ISSUE_RESPONSE_COLUMNS)
+        ).where(
+            ComicIssue.comic_id == comic_id
+        ).order_by(ComicIssue.issue_number)
+    )).all()
     
     issues_data = [
         {
@@ -383,12 +530,12 @@ async def get_comic(
 async def update_comic(
     comic_id: int,
     data: ComicUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update comic settings
     """
-    comic = db.query(Comic).filter(Comic.id == comic_id).first()
+    comic = await db.get(Comic, comic_id)
     if not comic:
         raise HTTPException(status_code=404, detail="Comic not found")
     
@@ -400,43 +547,33 @@ async def update_comic(
         comic.preferred_source = data.preferred_source
     
     comic.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(comic)
+    await db.commit()
+    await db.refresh(comic)
+    _invalidate_stats()
     
-    return ComicResponse(
-        id=comic.id,
-        title=comic.title,
-        slug=comic.slug,
-        comicvine_id=comic.comicvine_id,
-        description=comic.description,
-        cover_image=comic.cover_image,
-        publisher=comic.publisher,
-        start_year=comic.start_year,
-        count_of_issues=comic.count_of_issues,
-        writers=comic.writers,
-        artists=comic.artists,
-        comicvine_url=comic.comicvine_url,
-        monitored=comic.monitored,
-        total_issues=comic.total_issues,
-        downloaded_issues=comic.downloaded_issues
-    )
+    return ComicResponse.model_validate(comic)
 
 
 @router.delete("/{comic_id}")
 async def delete_comic(
     comic_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Remove comic from library
     """
-    comic = db.query(Comic).filter(Comic.id == comic_id).first()
+    comic = (await db.execute(
+        select(Comic.title, Comic.comicvine_id).where(Comic.id == comic_id)
+    )).first()
     if not comic:
         raise HTTPException(status_code=404, detail="Comic not found")
     
-    title = comic.title
-    db.delete(comic)
-    db.commit()
+    title, comicvine_id = comic
+    # Issues go with it through the ON DELETE CASCADE foreign key
+    await db.execute(delete(Comic).where(Comic.id == comic_id))
+    await db.commit()
+    _library_index.pop(comicvine_id, None)
+    _invalidate_stats()
     
     logger.info(f"Removed comic from library: {title}")
     
@@ -447,12 +584,14 @@ async def delete_comic(
 async def refresh_comic(
     comic_id: int,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Refresh comic metadata and issues from ComicVine
     """
-    comic = db.query(Comic).filter(Comic.id == comic_id).first()
+    comic = (await db.execute(
+        select(Comic.comicvine_id).where(Comic.id == comic_id)
+    )).first()
     if not comic:
         raise HTTPException(status_code=404, detail="Comic not found")
     
@@ -473,103 +612,94 @@ async def refresh_comic(
 async def get_issues(
     comic_id: int,
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all issues for a comic
     """
-    query = db.query(ComicIssue).filter(ComicIssue.comic_id == comic_id)
+    query = select(ComicIssue).options(
+        load_only(*ISSUE_RESPONSE_COLUMNS)
+    ).where(ComicIssue.comic_id == comic_id)
     
     if status:
-        query = query.filter(ComicIssue.status == status)
+        query = query.where(ComicIssue.status == status)
     
-    issues = query.order_by(ComicIssue.issue_number).all()
+    issues = (await db.scalars(query.order_by(ComicIssue.issue_number))).all()
     
-    return [IssueResponse(
-        id=issue.id,
-        comic_id=issue.comic_id,
-        issue_number=issue.issue_number,
-        title=issue.title,
-        cover_image=issue.cover_image,
-        release_date=issue.release_date,
-        status=issue.status,
-        file_path=issue.file_path
-    ) for issue in issues]
+    return [_construct_from_row(IssueResponse, issue) for issue in issues]
 
 
 # ============================================================================
 # BACKGROUND TASKS
 # ============================================================================
 
+ISSUE_INSERT_BATCH = 100
+
+
 async def fetch_comic_issues(comic_id: int, comicvine_id: int):
     """
     Fetch issues from ComicVine and add to database
     """
-    from app.database import SessionLocal
-    
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
         comicvine = get_comicvine_service()
         
-        # Get all issues (paginated)
-        page = 1
-        while True:
-            issues = await comicvine.get_volume_issues(comicvine_id, page=page, per_page=100)
-            
-            if not issues:
-                break
-            
-            for issue_data in issues:
-                # Check if issue already exists
-                existing = db.query(ComicIssue).filter(
-                    ComicIssue.comic_id == comic_id,
-                    ComicIssue.comicvine_id == issue_data['comicvine_id']
-                ).first()
-                
-                if not existing:
-                    issue = ComicIssue(
-                        comic_id=comic_id,
-                        issue_number=issue_data.get('issue_number'),
-                        title=issue_data.get('title'),
-                        comicvine_id=issue_data.get('comicvine_id'),
-                        cover_image=issue_data.get('cover_image'),
-                        description=issue_data.get('description'),
-                        release_date=issue_data.get('release_date'),
-                        writers=issue_data.get('writers'),
-                        artists=issue_data.get('artists'),
-                        colorists=issue_data.get('colorists'),
-                        status='pending',
-                        created_at=datetime.utcnow()
-                    )
-                    db.add(issue)
-            
-            db.commit()
-            
-            if len(issues) < 100:
-                break
-            page += 1
+        # Get all issues (remaining pages are fetched concurrently)
+        issues = await comicvine.get_all_volume_issues(comicvine_id)
+        
+        now = datetime.utcnow()
+        rows = [
+            {
+                'comic_id': comic_id,
+                'issue_number': issue_data.get('issue_number'),
+                'title': issue_data.get('title'),
+                'comicvine_id': issue_data.get('comicvine_id'),
+                'cover_image': issue_data.get('cover_image'),
+                'description': issue_data.get('description'),
+                'release_date': issue_data.get('release_date'),
+                'writers': issue_data.get('writers'),
+                'artists': issue_data.get('artists'),
+                'colorists': issue_data.get('colorists'),
+                'status': 'pending',
+                'created_at': now
+            }
+            for issue_data in issues
+        ]
+        
+        # Insert in batches to stay well under the bind parameter limit;
+        # the unique (comic_id, comicvine_id) index skips issues already stored
+        for start in range(0, len(rows), ISSUE_INSERT_BATCH):
+            await db.execute(
+                pg_insert(ComicIssue).values(rows[start:start + ISSUE_INSERT_BATCH]).on_conflict_do_nothing(
+                    index_elements=['comic_id', 'comicvine_id']
+                )
+            )
+        
+        # All batches go in one transaction: a single commit
+        await db.commit()
+        _invalidate_stats()
         
         logger.info(f"Fetched issues for comic {comic_id}")
         
     except Exception as e:
         logger.error(f"Error fetching issues for comic {comic_id}: {e}")
     finally:
-        db.close()
+        await db.close()
 
 
 async def refresh_comic_metadata(comic_id: int, comicvine_id: int):
     """
     Refresh comic metadata from ComicVine
     """
-    from app.database import SessionLocal
-    
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
         comicvine = get_comicvine_service()
+        # A refresh must bypass the metadata cache
+        comicvine.get_volume.invalidate(comicvine_id)
         details = await comicvine.get_volume(comicvine_id)
         
         if details:
-            comic = db.query(Comic).filter(Comic.id == comic_id).first()
+            comic = await db.get(Comic, comic_id)
             if comic:
                 comic.description = details.get('description')
                 comic.cover_image = details.get('cover_image')
@@ -579,7 +709,7 @@ async def refresh_comic_metadata(comic_id: int, comicvine_id: int):
                 comic.colorists = details.get('colorists')
                 comic.characters = details.get('characters')
                 comic.updated_at = datetime.utcnow()
-                db.commit()
+                await db.commit()
         
         # Also fetch new issues
         await fetch_comic_issues(comic_id, comicvine_id)
@@ -589,4 +719,4 @@ async def refresh_comic_metadata(comic_id: int, comicvine_id: int):
     except Exception as e:
         logger.error(f"Error refreshing comic {comic_id}: {e}")
     finally:
-        db.close()
+        await db.close()
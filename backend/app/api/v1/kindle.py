@@ -3,15 +3,18 @@ Kindle API Endpoints
 Send books to Kindle via STK (Send to Kindle API)
 """
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from pathlib import Path
 from datetime import datetime
+import asyncio
 import logging
 
-from app.database import get_db
+from app.database import get_async_db, AsyncSessionLocal
 from app.models.chapter import Chapter
 from app.models.settings import AppSettings
 
@@ -19,6 +22,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/kindle", tags=["kindle"])
 
+# Chapters whose files are being uploaded by a background send
+_sending_chapters = set()
+
 
 # Pydantic schemas
 class SendRequest(BaseModel):
@@ -36,41 +42,58 @@ class STKAuthorizeRequest(BaseModel):
     redirect_url: str
 
 
+def _existing_file_sizes(file_paths: Sequence[Path]) -> List[int]:
+    """Sizes in bytes of the paths that exist (one stat() per file)"""
+    sizes = []
+    for path in file_paths:
+        try:
+            sizes.append(path.stat().st_size)
+        except FileNotFoundError:
+            continue
+    return sizes
+
+
+def _missing_files(file_paths: Sequence[Path]) -> List[str]:
+    """Paths that don't exist on disk"""
+    return [str(path) for path in file_paths if not path.exists()]
+
+
 @router.get("/status/{chapter_id}")
-async def get_kindle_status(chapter_id: int, db: Session = Depends(get_db)):
+async def get_kindle_status(chapter_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get Kindle send status for a chapter.
-    Supports split files (multiple paths separated by '|' in converted_path).
+    Supports split files (one entry per part in converted_files).
     """
-    chapter = db.query(Chapter).filter(Chapter.id == chapter_id).first()
+    chapter = await db.get(Chapter, chapter_id)
 
     if not chapter:
         raise HTTPException(status_code=404, detail="Tomo not found")
 
-    # Handle multiple files (split files) separated by '|'
-    file_paths = []
-    if chapter.converted_path:
-        file_paths = [Path(p.strip()) for p in chapter.converted_path.split('|') if p.strip()]
-
-    # Check if all files exist
-    existing_files = [f for f in file_paths if f.exists()]
-    has_epub = len(existing_files) > 0
+    if chapter.converted_files:
+        # Sizes recorded at conversion time: no filesystem access needed
+        sizes = [f["size"] for f in chapter.converted_files]
+    else:
+        # Stat the files in a worker thread so slow (network) volumes don't block the event loop
+        sizes = await asyncio.to_thread(_existing_file_sizes, chapter.converted_file_paths)
+    has_epub = len(sizes) > 0
 
     # Calculate total size
-    total_size_mb = sum(f.stat().st_size / (1024 * 1024) for f in existing_files)
+    total_size_mb = sum(sizes) / (1024 * 1024)
 
     return {
         "chapter_id": chapter_id,
         "status": chapter.status,
         "sent_at": chapter.sent_at,
+        "sending": chapter_id in _sending_chapters,
+        "error_message": chapter.error_message,
         "has_epub": has_epub,
-        "file_count": len(existing_files),
+        "file_count": len(sizes),
         "file_size_mb": round(total_size_mb, 2)
     }
 
 
 @router.get("/can-send")
-async def check_kindle_configured(db: Session = Depends(get_db)):
+async def check_kindle_configured(db: AsyncSession = Depends(get_async_db)):
     """
     Check if STK is properly configured
     """
@@ -79,7 +102,7 @@ async def check_kindle_configured(db: Session = Depends(get_db)):
     sender = get_stk_sender()
     is_auth = sender.is_authenticated()
 
-    settings = db.query(AppSettings).first()
+    settings = await db.scalar(select(AppSettings).limit(1))
     has_device = settings and settings.stk_device_serial if settings else False
 
     return {
@@ -96,7 +119,7 @@ async def check_kindle_configured(db: Session = Depends(get_db)):
 # ============================================
 
 @router.get("/stk/status")
-async def stk_status(db: Session = Depends(get_db)):
+async def stk_status(db: AsyncSession = Depends(get_async_db)):
     """
     Check if STK (Send to Kindle) is authenticated
     """
@@ -107,10 +130,11 @@ async def stk_status(db: Session = Depends(get_db)):
 
     devices = []
     if is_auth:
-        devices = sender.get_devices()
+        # Blocking Amazon call on a cache miss
+        devices = await asyncio.to_thread(sender.get_devices)
 
     # Get saved device preference
-    settings = db.query(AppSettings).first()
+    settings = await db.scalar(select(AppSettings).limit(1))
     saved_device = None
     if settings and settings.stk_device_serial:
         saved_device = {
@@ -154,10 +178,10 @@ async def stk_authorize(data: STKAuthorizeRequest):
     if not data.redirect_url:
         raise HTTPException(status_code=400, detail="redirect_url is required")
 
-    success = sender.complete_authorization(data.redirect_url)
+    success = await asyncio.to_thread(sender.complete_authorization, data.redirect_url)
 
     if success:
-        devices = sender.get_devices()
+        devices = await asyncio.to_thread(sender.get_devices)
         return {
             "ok": True,
             "message": "Authorization successful!",
@@ -185,20 +209,83 @@ async def stk_get_devices():
             detail="Not authenticated. Use /stk/signin-url first."
         )
 
-    devices = sender.get_devices()
+    devices = await asyncio.to_thread(sender.get_devices)
     return {"devices": devices}
 
 
-@router.post("/stk/send/{chapter_id}")
+async def _send_chapter_task(
+    chapter_id: int,
+    file_paths: Sequence[Path],
+    base_title: str,
+    author: str,
+    device_serials: Optional[List[str]]
+):
+    """
+    Upload a chapter's file(s) to Kindle and record the result
+    """
+    from app.services.stk_kindle_sender import get_stk_sender
+
+    sender = get_stk_sender()
+
+    def part_title(idx: int) -> str:
+        part_suffix = f" (Parte {idx}/{len(file_paths)})" if len(file_paths) > 1 else ""
+        return f"{base_title}{part_suffix}"
+
+    try:
+        # Parts are uploaded concurrently (blocking uploads run in worker threads)
+        results = await sender.send_files(
+            [(book_file, part_title(idx)) for idx, book_file in enumerate(file_paths, 1)],
+            author=author,
+            device_serials=device_serials
+        )
+        failed_files = []
+        for book_file, result in zip(file_paths, results):
+            if result['success']:
+                logger.info(f"Sent {book_file.name} to Kindle")
+            else:
+                logger.error(f"Failed to send {book_file.name}: {result['message']}")
+                failed_files.append(book_file.name)
+
+        if len(failed_files) < len(file_paths):
+            values = {
+                "sent_at": datetime.utcnow(),
+                "status": "sent",
+                "error_message": (
+                    f"{len(failed_files)} archivo(s) fallidos: {', '.join(failed_files)}"
+                    if failed_files else None
+                )
+            }
+        else:
+            values = {"error_message": f"Failed to send: {', '.join(failed_files)}"}
+
+    except Exception as e:
+        logger.error(f"Error sending chapter {chapter_id} to Kindle: {e}")
+        values = {"error_message": f"Failed to send: {e}"}
+
+    # Single UPDATE, no need to load the row first; /status reports the result
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(Chapter).where(Chapter.id == chapter_id).values(**values))
+            await db.commit()
+    except Exception as e:
+        logger.error(f"Error recording Kindle send result for chapter {chapter_id}: {e}")
+    finally:
+        _sending_chapters.discard(chapter_id)
+
+
+@router.post("/stk/send/{chapter_id}", response_model=SendResponse, status_code=202)
 async def stk_send_to_kindle(
     chapter_id: int,
+    background_tasks: BackgroundTasks,
     data: Optional[SendRequest] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Send chapter to Kindle via STK
+
+    The upload runs in the background; poll /status/{chapter_id} for the result.
     """
-    from app.services.stk_kindle_sender import get_stk_sender
+    from app.services.stk_kindle_sender import get_stk_sender, MAX_FILE_SIZE
 
     sender = get_stk_sender()
 
@@ -208,8 +295,15 @@ async def stk_send_to_kindle(
             detail="STK not authenticated. Go to Settings and authorize with Amazon."
         )
 
-    # Get chapter
-    chapter = db.query(Chapter).filter(Chapter.id == chapter_id).first()
+    if chapter_id in _sending_chapters:
+        raise HTTPException(status_code=409, detail="Tomo is already being sent")
+
+    # Get chapter (with its manga for title/author, in the same query)
+    chapter = await db.scalar(
+        select(Chapter).options(
+            joinedload(Chapter.manga)
+        ).where(Chapter.id == chapter_id)
+    )
 
     if not chapter:
         raise HTTPException(status_code=404, detail="Tomo not found")
@@ -217,17 +311,27 @@ async def stk_send_to_kindle(
     if not chapter.converted_path:
         raise HTTPException(status_code=400, detail="Tomo has not been converted to EPUB yet")
 
-    # Handle multiple files (split files) separated by '|'
-    file_paths = [Path(p.strip()) for p in chapter.converted_path.split('|') if p.strip()]
+    # Handle multiple files (split files)
+    file_paths = chapter.converted_file_paths
 
-    # Verify all files exist
-    missing_files = [str(f) for f in file_paths if not f.exists()]
+    # Verify all files exist (in a worker thread, like the size lookups)
+    missing_files = await asyncio.to_thread(_missing_files, file_paths)
     if missing_files:
         raise HTTPException(
             status_code=400,
             detail=f"EPUB files not found: {', '.join(missing_files)}"
         )
 
+    # Reject oversized parts up front (sizes recorded at conversion time)
+    too_large = [
+        Path(f["path"]).name for f in chapter.converted_files or [] if f["size"] > MAX_FILE_SIZE
+    ]
+    if too_large:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Files too large for Send to Kindle: {', '.join(too_large)}"
+        )
+
     # Get author from authors list
     author = "Unknown"
     if chapter.manga.authors and len(chapter.manga.authors) > 0:
@@ -238,50 +342,27 @@ async def stk_send_to_kindle(
     if data and data.device_serial:
         device_serials = [data.device_serial]
     else:
-        settings = db.query(AppSettings).first()
+        settings = await db.scalar(select(AppSettings).limit(1))
         if settings and settings.stk_device_serial:
             device_serials = [settings.stk_device_serial]
             logger.info(f"Using saved device: {settings.stk_device_name or settings.stk_device_serial}")
 
-    # Send all files
-    sent_count = 0
-    failed_files = []
-
-    for idx, book_file in enumerate(file_paths, 1):
-        part_suffix = f" (Parte {idx}/{len(file_paths)})" if len(file_paths) > 1 else ""
-        title = f"{chapter.manga.title} - Tomo {chapter.number}{part_suffix}"
-
-        result = sender.send_file(
-            file_path=book_file,
-            title=title,
-            author=author,
-            device_serials=device_serials
-        )
-
-        if result['success']:
-            sent_count += 1
-            logger.info(f"Sent {book_file.name} to Kindle")
-        else:
-            failed_files.append(book_file.name)
-            logger.error(f"Failed to send {book_file.name}: {result['message']}")
-
-    if sent_count > 0:
-        chapter.sent_at = datetime.utcnow()
-        chapter.status = "sent"
-        db.commit()
-
-        message = f"Enviado {sent_count} archivo(s)"
-        if failed_files:
-            message += f" ({len(failed_files)} fallidos)"
-
-        return SendResponse(
-            ok=True,
-            message=message,
-            chapter_id=chapter_id,
-            sent_at=chapter.sent_at
-        )
-    else:
-        raise HTTPException(status_code=500, detail=f"Failed to send: {', '.join(failed_files)}")
+    _sending_chapters.add(chapter_id)
+    background_tasks.add_task(
+        _send_chapter_task,
+        chapter_id,
+        file_paths,
+        f"{chapter.manga.title} - Tomo {chapter.number}",
+        author,
+        device_serials
+    )
+
+    return SendResponse(
+        ok=True,
+        message=f"Enviando {len(file_paths)} archivo(s)",
+        chapter_id=chapter_id,
+        sent_at=None
+    )
 
 
 @router.post("/stk/logout")
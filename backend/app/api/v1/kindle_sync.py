@@ -3,16 +3,20 @@ Kindle Sync API Endpoints
 Provides direct download access for Kindle browser and sync functionality
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import FileResponse, HTMLResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.orm import Session, joinedload
+from html import escape
+from itertools import groupby
+from operator import attrgetter
 from pathlib import Path
-from typing import Optional
+from typing import List, Tuple
 import logging
 import os
 
 from app.database import get_db
-from app.models.chapter import Chapter
+from app.models.chapter import Chapter, converted_paths_of
 from app.models.manga import Manga
 
 logger = logging.getLogger(__name__)
@@ -22,41 +26,8 @@ router = APIRouter(prefix="/kindle-sync", tags=["kindle-sync"])
 KINDLE_DIR = Path("/manga/kindle")
 
 
-@router.get("/", response_class=HTMLResponse)
-async def kindle_home(request: Request, db: Session = Depends(get_db)):
-    """
-    Simple HTML page optimized for Kindle browser
-    Lists all available EPUBs for download
-    """
-    # Get all converted chapters
-    chapters = db.query(Chapter).join(Manga).filter(
-        Chapter.converted_path.isnot(None)
-    ).order_by(Manga.title, Chapter.number).all()
-
-    # Group by manga
-    manga_dict = {}
-    for chapter in chapters:
-        manga_title = chapter.manga.title
-        if manga_title not in manga_dict:
-            manga_dict[manga_title] = []
-
-        # Check if file exists and get size
-        file_path = Path(chapter.converted_path)
-        if file_path.exists():
-            size_mb = file_path.stat().st_size / (1024 * 1024)
-            manga_dict[manga_title].append({
-                'id': chapter.id,
-                'number': int(chapter.number) if chapter.number == int(chapter.number) else chapter.number,
-                'title': chapter.title,
-                'size_mb': size_mb,
-                'filename': file_path.name,
-                'sent': chapter.sent_at is not None
-            })
-
-    # Generate simple HTML for Kindle browser
-    base_url = str(request.base_url).rstrip('/')
-
-    html = """<!DOCTYPE html>
+# Static parts of the Kindle browser page (kindle_home fills in the listing)
+KINDLE_HOME_HEAD = """<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -124,88 +95,201 @@ async def kindle_home(request: Request, db: Session = Depends(get_db)):
     <p>Tu biblioteca de manga</p>
 """
 
-    if not manga_dict:
-        html += '<p class="empty">No hay mangas disponibles para descargar.</p>'
-    else:
-        for manga_title, chapters in sorted(manga_dict.items()):
-            html += f'<h2>{manga_title}</h2>\n'
-            for ch in sorted(chapters, key=lambda x: x['number']):
-                sent_mark = ' <span class="sent">[Enviado]</span>' if ch['sent'] else ''
-                html += f'''<div class="chapter">
-    <a href="{base_url}/api/v1/kindle-sync/download/{ch['id']}"">Tomo {ch['number']}</a>
-    <span class="size">({ch['size_mb']:.0f} MB)</span>{sent_mark}
-</div>
-'''
-
-    html += f'''
+KINDLE_HOME_FOOT = """
     <a href="{base_url}/api/v1/kindle-sync/" class="refresh">Actualizar lista</a>
     <p style="font-size: 12px; color: #999; text-align: center;">
         Toca en un tomo para descargarlo directamente al Kindle.
     </p>
 </body>
-</html>'''
+</html>"""
+
+
+class EpubFileResponse(FileResponse):
+    """FileResponse reading in 128KB chunks (half the thread hops of the 64KB default)"""
+    chunk_size = 128 * 1024
+
+
+def _converted_parts(row) -> List[Tuple[int, int]]:
+    """
+    (part number, size in bytes) of each available converted file of a chapter
+
+    Part numbers match download_epub's ?part= parameter. Uses the sizes
+    recorded at conversion time; only chapters converted before those
+    were stored fall back to stat() (missing files are skipped).
+    """
+    if row.converted_files:
+        return [(part, f["size"]) for part, f in enumerate(row.converted_files, 1)]
+
+    parts = []
+    for part, path in enumerate(converted_paths_of(row.converted_files, row.converted_path), 1):
+        try:
+            parts.append((part, path.stat().st_size))
+        except FileNotFoundError:
+            continue
+    return parts
+
+
+def _converted_chapters(db: Session):
+    """
+    Converted chapters with their manga title, ordered by manga and number
+
+    Selects plain columns (lightweight rows, no ORM objects or identity map).
+    """
+    return db.query(
+        Manga.title.label('manga_title'),
+        Chapter.id,
+        Chapter.manga_id,
+        Chapter.number,
+        Chapter.title,
+        Chapter.converted_path,
+        Chapter.converted_files,
+        Chapter.sent_at
+    ).select_from(Chapter).join(Manga, Manga.id == Chapter.manga_id).filter(
+        Chapter.converted_path.isnot(None)
+    ).order_by(Manga.title, Chapter.number).all()
+
+
+@router.get("/", response_class=HTMLResponse)
+def kindle_home(request: Request, db: Session = Depends(get_db)):
+    """
+    Simple HTML page optimized for Kindle browser
+    Lists all available EPUBs for download
+    """
+    # Group by manga (rows already come sorted by manga title and number)
+    manga_dict = {}
+    for manga_title, rows in groupby(_converted_chapters(db), key=attrgetter('manga_title')):
+        available = []
+        for row in rows:
+            # Sizes recorded at conversion time (no filesystem access per row)
+            converted_parts = _converted_parts(row)
+            if converted_parts:
+                available.append({
+                    'id': row.id,
+                    'number': int(row.number) if row.number == int(row.number) else row.number,
+                    'title': row.title,
+                    'parts': converted_parts,
+                    'split': len(converted_paths_of(row.converted_files, row.converted_path)) > 1,
+                    'sent': row.sent_at is not None
+                })
+        if available:
+            manga_dict[manga_title] = available
+
+    # Generate simple HTML for Kindle browser
+    base_url = escape(str(request.base_url).rstrip('/'))
+
+    parts = [KINDLE_HOME_HEAD]
+
+    if not manga_dict:
+        parts.append('<p class="empty">No hay mangas disponibles para descargar.</p>')
+    else:
+        for manga_title, chapters in manga_dict.items():
+            parts.append(f'<h2>{escape(manga_title)}</h2>\n')
+            for ch in chapters:
+                sent_mark = ' <span class="sent">[Enviado]</span>' if ch['sent'] else ''
+                parts.append('<div class="chapter">\n')
+                # Split tomos get one link (and size) per part
+                for part, size in ch['parts']:
+                    if ch['split']:
+                        href = f"{base_url}/api/v1/kindle-sync/download/{ch['id']}?part={part}"
+                        label = f"Tomo {ch['number']} - Parte {part}"
+                    else:
+                        href = f"{base_url}/api/v1/kindle-sync/download/{ch['id']}"
+                        label = f"Tomo {ch['number']}"
+                    parts.append(f'''    <a href="{href}">{label}</a>
+    <span class="size">({size / (1024 * 1024):.0f} MB)</span>{sent_mark}<br>
+''')
+                    sent_mark = ''
+                parts.append('</div>\n')
+
+    parts.append(KINDLE_HOME_FOOT.format(base_url=base_url))
+
+    # Built as a list and joined once (linear in the number of tomos)
+    html = ''.join(parts)
 
     return HTMLResponse(content=html)
 
 
 @router.get("/download/{chapter_id}")
-async def download_epub(chapter_id: int, db: Session = Depends(get_db)):
+def download_epub(
+    chapter_id: int,
+    part: int = Query(1, ge=1, description="Part number for split tomos"),
+    db: Session = Depends(get_db)
+):
     """
     Download EPUB file directly
     """
-    chapter = db.query(Chapter).filter(Chapter.id == chapter_id).first()
+    chapter = db.query(Chapter).options(
+        joinedload(Chapter.manga)
+    ).filter(Chapter.id == chapter_id).first()
 
     if not chapter:
         raise HTTPException(status_code=404, detail="Tomo not found")
 
-    if not chapter.converted_path:
+    file_paths = chapter.converted_file_paths
+    if not file_paths:
         raise HTTPException(status_code=400, detail="EPUB not available")
 
-    file_path = Path(chapter.converted_path)
+    if part > len(file_paths):
+        raise HTTPException(status_code=404, detail="Part not found")
 
-    if not file_path.exists():
+    file_path = file_paths[part - 1]
+
+    # One stat() serves both the existence check and the response headers
+    try:
+        stat_result = os.stat(file_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found on server")
 
     # Get manga title for filename
-    manga = db.query(Manga).filter(Manga.id == chapter.manga_id).first()
+    manga = chapter.manga
     chapter_num = int(chapter.number) if chapter.number == int(chapter.number) else chapter.number
 
     # Create a clean filename
     clean_title = manga.title if manga else "Manga"
-    filename = f"{clean_title} - Tomo {chapter_num}.epub"
+    part_suffix = f" - Parte {part}" if len(file_paths) > 1 else ""
+    filename = f"{clean_title} - Tomo {chapter_num}{part_suffix}.epub"
 
     logger.info(f"Kindle download: {filename}")
 
-    return FileResponse(
+    return EpubFileResponse(
         path=str(file_path),
         filename=filename,
-        media_type="application/epub+zip"
+        media_type="application/epub+zip",
+        stat_result=stat_result
     )
 
 
 @router.get("/list")
-async def list_available(db: Session = Depends(get_db)):
+def list_available(db: Session = Depends(get_db)):
     """
     JSON list of available EPUBs
     """
-    chapters = db.query(Chapter).join(Manga).filter(
-        Chapter.converted_path.isnot(None)
-    ).order_by(Manga.title, Chapter.number).all()
-
     result = []
-    for chapter in chapters:
-        file_path = Path(chapter.converted_path)
-        if file_path.exists():
+    for row in _converted_chapters(db):
+        converted_parts = _converted_parts(row)
+        if converted_parts:
+            paths = converted_paths_of(row.converted_files, row.converted_path)
+            size = sum(part_size for _, part_size in converted_parts)
             result.append({
-                'id': chapter.id,
-                'manga_id': chapter.manga_id,
-                'manga_title': chapter.manga.title,
-                'number': chapter.number,
-                'title': chapter.title,
-                'size_mb': round(file_path.stat().st_size / (1024 * 1024), 2),
-                'filename': file_path.name,
-                'sent_at': chapter.sent_at.isoformat() if chapter.sent_at else None,
-                'download_url': f"/api/v1/kindle-sync/download/{chapter.id}"
+                'id': row.id,
+                'manga_id': row.manga_id,
+                'manga_title': row.manga_title,
+                'number': row.number,
+                'title': row.title,
+                'size_mb': round(size / (1024 * 1024), 2),
+                'filename': paths[0].name,
+                'sent_at': row.sent_at.isoformat() if row.sent_at else None,
+                'download_url': f"/api/v1/kindle-sync/download/{row.id}",
+                # One entry per file; split tomos are downloaded part by part
+                'parts': [
+                    {
+                        'part': part,
+                        'filename': paths[part - 1].name,
+                        'size_mb': round(part_size / (1024 * 1024), 2),
+                        'download_url': f"/api/v1/kindle-sync/download/{row.id}?part={part}"
+                    }
+                    for part, part_size in converted_parts
+                ]
             })
 
     return {
@@ -215,19 +299,23 @@ async def list_available(db: Session = Depends(get_db)):
 
 
 @router.post("/mark-downloaded/{chapter_id}")
-async def mark_as_downloaded(chapter_id: int, db: Session = Depends(get_db)):
+def mark_as_downloaded(chapter_id: int, db: Session = Depends(get_db)):
     """
     Mark chapter as downloaded/sent (for tracking)
     """
     from datetime import datetime
 
-    chapter = db.query(Chapter).filter(Chapter.id == chapter_id).first()
+    # Single UPDATE; no matched row means the tomo doesn't exist
+    result = db.execute(
+        update(Chapter).where(Chapter.id == chapter_id).values(
+            sent_at=datetime.utcnow(),
+            status='sent'
+        )
+    )
 
-    if not chapter:
+    if result.rowcount == 0:
         raise HTTPException(status_code=404, detail="Tomo not found")
 
-    chapter.sent_at = datetime.utcnow()
-    chapter.status = 'sent'
     db.commit()
 
     return {'ok': True, 'message': 'Marked as downloaded'}
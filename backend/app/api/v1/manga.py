@@ -3,12 +3,14 @@ Manga API Endpoints - Enhanced with Anilist Integration
 Kaizoku-inspired approach to manga library management
 """
 
+import asyncio
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, raiseload
+from sqlalchemy import and_, func, select, insert, update, delete, exists
 from typing import List, Optional
-from app.database import get_db
+from app.database import get_async_db, AsyncSessionLocal
 from app.models.manga import Manga
 from app.models.chapter import Chapter
 from app.schemas.manga import (
@@ -25,9 +27,10 @@ from app.schemas.manga import (
     LibraryStats
 )
 from app.schemas.chapter import ChapterResponse
-from app.services.anilist import AnilistService
+from app.services.anilist import get_anilist_service
 from app.services.scraper import TomosMangaScraper
 from app.services.mangaycomics_scraper import MangayComicsScraper
+from app.services.tomosmanga_search import get_tomosmanga_search, get_mangaycomics_search
 import logging
 from slugify import slugify
 from pydantic import BaseModel
@@ -37,6 +40,60 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/manga", tags=["manga"])
 
+# Columns serialized by MangaResponse (list endpoints load only these)
+MANGA_RESPONSE_COLUMNS = (
+    Manga.id, Manga.title, Manga.slug, Manga.source_url, Manga.source_type,
+    Manga.anilist_id, Manga.mal_id, Manga.title_romaji, Manga.title_english, Manga.title_native,
+    Manga.cover_image, Manga.banner_image, Manga.cover_color, Manga.description,
+    Manga.format, Manga.status, Manga.start_date, Manga.end_date,
+    Manga.chapters_total, Manga.volumes_total, Manga.average_score, Manga.popularity,
+    Manga.genres, Manga.tags, Manga.monitored, Manga.auto_download, Manga.last_check,
+    Manga.created_at, Manga.updated_at, Manga.anilist_url, Manga.country,
+)
+
+
+async def _library_by_anilist_id(db: AsyncSession, anilist_ids: List[int]) -> dict:
+    """Map anilist_id -> (id, monitored) row for the given ids already in the library (single query)"""
+    if not anilist_ids:
+        return {}
+    rows = await db.execute(
+        select(Manga.anilist_id, Manga.id, Manga.monitored).where(Manga.anilist_id.in_(anilist_ids))
+    )
+    return {row.anilist_id: row for row in rows}
+
+
+async def _search_sources(tomos_search, mangay_search, title: str):
+    """
+    Run a TomosManga and a MangayComics search concurrently
+
+    The searches use blocking requests, so each runs in a worker thread.
+    A search that raises is logged and returns None, so one source being
+    down doesn't fail the other.
+    """
+    results = await asyncio.gather(
+        asyncio.to_thread(tomos_search, title),
+        asyncio.to_thread(mangay_search, title),
+        return_exceptions=True
+    )
+    for source, result in zip(('TomosManga', 'MangayComics'), results):
+        if isinstance(result, Exception):
+            logger.error(f"Error searching {source} for '{title}': {result}")
+    return [None if isinstance(result, Exception) else result for result in results]
+
+
+async def _unique_slug(db: AsyncSession, base_slug: str) -> str:
+    """First free slug among base_slug, base_slug-1, base_slug-2... (single query)"""
+    taken = set((await db.scalars(
+        select(Manga.slug).where(Manga.slug.startswith(base_slug, autoescape=True))
+    )).all())
+
+    slug = base_slug
+    counter = 1
+    while slug in taken:
+        slug = f"{base_slug}-{counter}"
+        counter += 1
+    return slug
+
 
 # ============================================================================
 # DISCOVERY & SEARCH - Kaizoku Style
@@ -46,19 +103,20 @@ router = APIRouter(prefix="/manga", tags=["manga"])
 async def get_trending_manga(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get trending manga from Anilist
     """
-    anilist = AnilistService()
+    anilist = get_anilist_service()
     trending = await anilist.get_trending_manga(page=page, per_page=limit)
 
-    # Check which ones are already in library
+    # Check which ones are already in library (single query)
+    owned = await _library_by_anilist_id(db, [item['anilist_id'] for item in trending])
+
     result = []
     for item in trending:
-        # Check if in library
-        in_library = db.query(Manga).filter(Manga.anilist_id == item['anilist_id']).first()
+        in_library = owned.get(item['anilist_id'])
 
         card = {
             "id": in_library.id if in_library else 0,
@@ -84,17 +142,20 @@ async def get_trending_manga(
 async def get_popular_manga(
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get popular manga from Anilist
     """
-    anilist = AnilistService()
+    anilist = get_anilist_service()
     popular = await anilist.get_popular_manga(page=page, per_page=limit)
 
+    # Check which ones are already in library (single query)
+    owned = await _library_by_anilist_id(db, [item['anilist_id'] for item in popular])
+
     result = []
     for item in popular:
-        in_library = db.query(Manga).filter(Manga.anilist_id == item['anilist_id']).first()
+        in_library = owned.get(item['anilist_id'])
 
         card = {
             "id": in_library.id if in_library else 0,
@@ -121,7 +182,7 @@ async def search_manga(
     q: str = Query(..., min_length=2, description="Search query"),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Search manga on AniList - the best manga/anime database
@@ -129,12 +190,16 @@ async def search_manga(
     results = []
 
     try:
-        anilist = AnilistService()
+        anilist = get_anilist_service()
         anilist_results = await anilist.search_manga(q, page=page, per_page=limit)
 
+        # Check which ones are already in library (single query)
+        owned = await _library_by_anilist_id(
+            db, [item['anilist_id'] for item in anilist_results['results']]
+        )
+
         for item in anilist_results['results']:
-            # Check if already in library
-            in_library = db.query(Manga).filter(Manga.anilist_id == item['anilist_id']).first()
+            in_library = owned.get(item['anilist_id'])
 
             results.append(MangaSearch(
                 title=item['title'],
@@ -165,36 +230,32 @@ async def search_manga(
 # ============================================================================
 
 @router.get("/", response_model=List[MangaResponse])
-def list_manga(
+async def list_manga(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     monitored: Optional[bool] = None,
     status: Optional[str] = None,
     search: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List manga in library with filtering
     """
-    query = db.query(Manga)
+    # raiseload: a relationship touched while serializing fails loudly instead of
+    # issuing one lazy query per row
+    query = select(Manga).options(load_only(*MANGA_RESPONSE_COLUMNS), raiseload('*'))
 
     if monitored is not None:
-        query = query.filter(Manga.monitored == monitored)
+        query = query.where(Manga.monitored == monitored)
 
     if status:
-        query = query.filter(Manga.status == status)
+        query = query.where(Manga.status == status)
 
     if search:
-        search_pattern = f"%{search}%"
-        query = query.filter(
-            or_(
-                Manga.title.ilike(search_pattern),
-                Manga.title_english.ilike(search_pattern),
-                Manga.title_romaji.ilike(search_pattern)
-            )
-        )
+        # One ILIKE over all titles (generated column with a trigram index)
+        query = query.where(Manga.search_blob.ilike(f"%{search}%"))
 
-    manga_list = query.offset(skip).limit(limit).all()
+    manga_list = (await db.scalars(query.offset(skip).limit(limit))).all()
     return manga_list
 
 
@@ -202,33 +263,28 @@ def list_manga(
 async def add_manga_from_anilist(
     data: MangaCreateFromAnilist,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add manga to library from Anilist ID (Kaizoku-style)
     This is the preferred method!
     """
     # Check if already exists
-    existing = db.query(Manga).filter(Manga.anilist_id == data.anilist_id).first()
+    existing = await db.scalar(
+        select(exists().where(Manga.anilist_id == data.anilist_id))
+    )
     if existing:
         raise HTTPException(status_code=400, detail="Manga already in library")
 
     # Fetch metadata from Anilist
-    anilist = AnilistService()
+    anilist = get_anilist_service()
     metadata = await anilist.get_manga_by_id(data.anilist_id)
 
     if not metadata:
         raise HTTPException(status_code=404, detail="Manga not found on Anilist")
 
-    # Create slug
-    slug = slugify(metadata['title'])
-
-    # Make slug unique
-    base_slug = slug
-    counter = 1
-    while db.query(Manga).filter(Manga.slug == slug).first():
-        slug = f"{base_slug}-{counter}"
-        counter += 1
+    # Create a unique slug
+    slug = await _unique_slug(db, slugify(metadata['title']))
 
     # Create manga in database
     manga = Manga(
@@ -278,33 +334,30 @@ async def add_manga_from_anilist(
     )
 
     db.add(manga)
-    db.commit()
-    db.refresh(manga)
+    await db.commit()
+    await db.refresh(manga)
 
     logger.info(f"Added manga from Anilist: {manga.title} (ID: {manga.anilist_id})")
 
     # If source URL not provided, try auto-search
     if not manga.source_url:
-        from app.services.tomosmanga_search import TomosMangaSearch, MangayComicsSearch
-
-        tomos_search = TomosMangaSearch()
-        result = tomos_search.find_best_match(manga.title)
+        # Both sources are searched at once; TomosManga wins when it has a match
+        result, results = await _search_sources(
+            get_tomosmanga_search().find_best_match, get_mangaycomics_search().search, manga.title
+        )
 
         if result:
             manga.source_url = result['url']
             manga.source_type = 'tomosmanga'
-            db.commit()
-            db.refresh(manga)
+            await db.commit()
+            await db.refresh(manga)
+            logger.info(f"Auto-found source: {manga.source_url}")
+        elif results:
+            manga.source_url = results[0]['url']
+            manga.source_type = 'mangaycomics'
+            await db.commit()
+            await db.refresh(manga)
             logger.info(f"Auto-found source: {manga.source_url}")
-        else:
-            mangay_search = MangayComicsSearch()
-            results = mangay_search.search(manga.title)
-            if results:
-                manga.source_url = results[0]['url']
-                manga.source_type = 'mangaycomics'
-                db.commit()
-                db.refresh(manga)
-                logger.info(f"Auto-found source: {manga.source_url}")
 
     # If source URL available, fetch chapters in background
     if manga.source_url:
@@ -317,14 +370,16 @@ async def add_manga_from_anilist(
 async def add_manga_from_url(
     data: MangaCreateFromURL,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Add manga from direct URL (legacy method)
     Optionally link to Anilist for metadata
     """
     # Check if already exists
-    existing = db.query(Manga).filter(Manga.source_url == data.source_url).first()
+    existing = await db.scalar(
+        select(exists().where(Manga.source_url == data.source_url))
+    )
     if existing:
         raise HTTPException(status_code=400, detail="Manga already in library")
 
@@ -336,19 +391,12 @@ async def add_manga_from_url(
         raise HTTPException(status_code=400, detail="Could not fetch manga from URL")
 
     title = details['title']
-    slug = slugify(title)
-
-    # Make slug unique
-    base_slug = slug
-    counter = 1
-    while db.query(Manga).filter(Manga.slug == slug).first():
-        slug = f"{base_slug}-{counter}"
-        counter += 1
+    slug = await _unique_slug(db, slugify(title))
 
     # Fetch Anilist metadata if ID provided
     metadata = None
     if data.anilist_id:
-        anilist = AnilistService()
+        anilist = get_anilist_service()
         metadata = await anilist.get_manga_by_id(data.anilist_id)
 
     # Create manga
@@ -388,27 +436,24 @@ async def add_manga_from_url(
         manga.country = metadata.get('country')
 
     db.add(manga)
-    db.commit()
-    db.refresh(manga)
+    await db.commit()
+    await db.refresh(manga)
 
     # Add chapters
     if details.get('chapters'):
-        for ch_data in details['chapters']:
-            download_url = ""
-            if ch_data.get('download_links'):
-                download_url = _select_best_download_link(ch_data['download_links'])
-
-            chapter = Chapter(
-                manga_id=manga.id,
-                number=ch_data['number'],
-                title=ch_data.get('title', ''),
-                url=ch_data.get('url', data.source_url),
-                download_url=download_url,
-                status='pending'
-            )
-            db.add(chapter)
-
-        db.commit()
+        # One bulk INSERT (executemany over multi-row VALUES) instead of a row per add()
+        await db.execute(insert(Chapter), [
+            {
+                "manga_id": manga.id,
+                "number": ch_data['number'],
+                "title": ch_data.get('title', ''),
+                "url": ch_data.get('url', data.source_url),
+                "download_url": _select_best_download_link(ch_data.get('download_links') or []),
+                "status": 'pending'
+            }
+            for ch_data in details['chapters']
+        ])
+        await db.commit()
         logger.info(f"Added {len(details['chapters'])} chapters for {manga.title}")
 
     return manga
@@ -419,38 +464,48 @@ async def add_manga_from_url(
 # ============================================================================
 
 @router.get("/library/stats", response_model=LibraryStats)
-def get_library_stats(db: Session = Depends(get_db)):
+async def get_library_stats(db: AsyncSession = Depends(get_async_db)):
     """
     Get overall library statistics
     """
-    total_manga = db.query(func.count(Manga.id)).scalar()
-    monitored = db.query(func.count(Manga.id)).filter(Manga.monitored == True).scalar()
-    total_chapters = db.query(func.count(Chapter.id)).scalar()
-    downloaded = db.query(func.count(Chapter.id)).filter(
-        Chapter.status.in_(['downloaded', 'converted', 'sent'])
-    ).scalar()
-    pending = db.query(func.count(Chapter.id)).filter(Chapter.status == 'pending').scalar()
-
-    # Genre distribution
-    manga_with_genres = db.query(Manga).filter(Manga.genres != None).all()
-    genre_counts = {}
-    for manga in manga_with_genres:
-        if manga.genres:
-            for genre in manga.genres:
-                genre_counts[genre] = genre_counts.get(genre, 0) + 1
+    manga_counts = (await db.execute(
+        select(
+            func.count(Manga.id).label('total'),
+            func.count(Manga.id).filter(Manga.monitored == True).label('monitored')
+        )
+    )).one()
+    chapter_counts = (await db.execute(
+        select(
+            func.count(Chapter.id).label('total'),
+            func.count(Chapter.id).filter(
+                Chapter.status.in_(['downloaded', 'converted', 'sent'])
+            ).label('downloaded'),
+            func.count(Chapter.id).filter(Chapter.status == 'pending').label('pending')
+        )
+    )).one()
+
+    # Genre distribution (genres is a JSON array: unnest and count in Postgres)
+    genres = select(
+        func.json_array_elements_text(Manga.genres).label('genre')
+    ).where(func.json_typeof(Manga.genres) == 'array').subquery()
+    genre_counts = dict((await db.execute(
+        select(genres.c.genre, func.count()).group_by(genres.c.genre)
+    )).all())
 
     # Status distribution
-    status_counts = {}
-    for manga in db.query(Manga).all():
-        if manga.status:
-            status_counts[manga.status] = status_counts.get(manga.status, 0) + 1
+    status_counts = dict((await db.execute(
+        select(Manga.status, func.count(Manga.id)).where(
+            Manga.status != None,
+            Manga.status != ''
+        ).group_by(Manga.status)
+    )).all())
 
     return LibraryStats(
-        total_manga=total_manga or 0,
-        monitored_manga=monitored or 0,
-        total_chapters=total_chapters or 0,
-        downloaded_chapters=downloaded or 0,
-        pending_downloads=pending or 0,
+        total_manga=manga_counts.total,
+        monitored_manga=manga_counts.monitored,
+        total_chapters=chapter_counts.total,
+        downloaded_chapters=chapter_counts.downloaded,
+        pending_downloads=chapter_counts.pending,
         disk_usage_mb=0.0,  # TODO: Calculate actual disk usage
         genres_distribution=genre_counts,
         status_distribution=status_counts
@@ -462,37 +517,33 @@ def get_library_stats(db: Session = Depends(get_db)):
 # ============================================================================
 
 @router.get("/{manga_id}", response_model=MangaDetailResponse)
-def get_manga(manga_id: int, db: Session = Depends(get_db)):
+async def get_manga(manga_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get detailed manga information
     """
-    manga = db.query(Manga).filter(Manga.id == manga_id).first()
+    manga = await db.get(Manga, manga_id, options=[raiseload('*')])
 
     if not manga:
         raise HTTPException(status_code=404, detail="Manga not found")
 
-    # Calculate stats
-    total_in_library = db.query(Chapter).filter(Chapter.manga_id == manga_id).count()
-    downloaded = db.query(Chapter).filter(
-        and_(
-            Chapter.manga_id == manga_id,
-            Chapter.status.in_(['downloaded', 'converted', 'sent'])
-        )
-    ).count()
-    pending = db.query(Chapter).filter(
-        and_(
-            Chapter.manga_id == manga_id,
-            Chapter.status == 'pending'
-        )
-    ).count()
+    # Calculate stats (one filtered aggregate over the manga's chapters)
+    counts = (await db.execute(
+        select(
+            func.count(Chapter.id).label('total'),
+            func.count(Chapter.id).filter(
+                Chapter.status.in_(['downloaded', 'converted', 'sent'])
+            ).label('downloaded'),
+            func.count(Chapter.id).filter(Chapter.status == 'pending').label('pending')
+        ).where(Chapter.manga_id == manga_id)
+    )).one()
 
-    # Build response manually
-    response_data = manga.__dict__.copy()
-    response_data['total_chapters_in_library'] = total_in_library
-    response_data['downloaded_chapters'] = downloaded
-    response_data['pending_chapters'] = pending
+    # Read the declared fields straight from the ORM object (from_attributes)
+    response = MangaDetailResponse.model_validate(manga)
+    response.total_chapters_in_library = counts.total
+    response.downloaded_chapters = counts.downloaded
+    response.pending_chapters = counts.pending
 
-    return MangaDetailResponse(**response_data)
+    return response
 
 
 @router.put("/{manga_id}", response_model=MangaResponse)
@@ -500,12 +551,12 @@ async def update_manga(
     manga_id: int,
     data: MangaUpdate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update manga settings
     """
-    manga = db.query(Manga).filter(Manga.id == manga_id).first()
+    manga = await db.get(Manga, manga_id)
 
     if not manga:
         raise HTTPException(status_code=404, detail="Manga not found")
@@ -521,8 +572,8 @@ async def update_manga(
     for key, value in update_data.items():
         setattr(manga, key, value)
 
-    db.commit()
-    db.refresh(manga)
+    await db.commit()
+    await db.refresh(manga)
 
     # If source URL was updated, fetch chapters in background
     if source_url_updated:
@@ -534,25 +585,21 @@ async def update_manga(
 
 
 @router.get("/{manga_id}/search-source")
-async def search_manga_source(manga_id: int, db: Session = Depends(get_db)):
+async def search_manga_source(manga_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Busca automáticamente la source_url para un manga sin source
     """
-    from app.services.tomosmanga_search import TomosMangaSearch, MangayComicsSearch
-
-    manga = db.query(Manga).filter(Manga.id == manga_id).first()
+    manga = await db.get(Manga, manga_id)
 
     if not manga:
         raise HTTPException(status_code=404, detail="Manga not found")
 
-    tomos_search = TomosMangaSearch()
-    mangay_search = MangayComicsSearch()
-
-    # Buscar en ambas fuentes
-    tomos_results = tomos_search.search(manga.title)
-    mangay_results = mangay_search.search(manga.title)
+    # Buscar en ambas fuentes a la vez
+    tomos_results, mangay_results = await _search_sources(
+        get_tomosmanga_search().search, get_mangaycomics_search().search, manga.title
+    )
 
-    all_results = tomos_results + mangay_results
+    all_results = (tomos_results or []) + (mangay_results or [])
 
     if not all_results:
         raise HTTPException(status_code=404, detail="No se encontraron fuentes para este manga")
@@ -569,12 +616,12 @@ async def set_manga_source(
     manga_id: int,
     source_url: str,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Establece la source_url de un manga y descarga los capítulos
     """
-    manga = db.query(Manga).filter(Manga.id == manga_id).first()
+    manga = await db.get(Manga, manga_id)
 
     if not manga:
         raise HTTPException(status_code=404, detail="Manga not found")
@@ -588,8 +635,8 @@ async def set_manga_source(
 
     manga.source_url = source_url
     manga.source_type = source_type
-    db.commit()
-    db.refresh(manga)
+    await db.commit()
+    await db.refresh(manga)
 
     # Fetch chapters in background
     background_tasks.add_task(_fetch_chapters_from_source, manga_id, source_url)
@@ -605,18 +652,18 @@ async def set_manga_source(
 
 
 @router.delete("/{manga_id}", status_code=204)
-def delete_manga(manga_id: int, db: Session = Depends(get_db)):
+async def delete_manga(manga_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Delete manga and all its chapters
     """
-    manga = db.query(Manga).filter(Manga.id == manga_id).first()
+    title = await db.scalar(select(Manga.title).where(Manga.id == manga_id))
 
-    if not manga:
+    if title is None:
         raise HTTPException(status_code=404, detail="Manga not found")
 
-    title = manga.title
-    db.delete(manga)
-    db.commit()
+    # Chapters go with it through the ON DELETE CASCADE foreign key
+    await db.execute(delete(Manga).where(Manga.id == manga_id))
+    await db.commit()
 
     logger.info(f"Deleted manga: {title}")
     return None
@@ -626,12 +673,12 @@ def delete_manga(manga_id: int, db: Session = Depends(get_db)):
 async def refresh_manga(
     manga_id: int,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Force refresh of manga chapters
     """
-    manga = db.query(Manga).filter(Manga.id == manga_id).first()
+    manga = await db.get(Manga, manga_id)
 
     if not manga:
         raise HTTPException(status_code=404, detail="Manga not found")
@@ -642,75 +689,62 @@ async def refresh_manga(
 
 
 @router.get("/{manga_id}/stats", response_model=MangaStats)
-def get_manga_stats(manga_id: int, db: Session = Depends(get_db)):
+async def get_manga_stats(manga_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get detailed statistics for a manga
     """
-    manga = db.query(Manga).filter(Manga.id == manga_id).first()
+    manga = await db.get(Manga, manga_id)
 
     if not manga:
         raise HTTPException(status_code=404, detail="Manga not found")
 
-    total = db.query(Chapter).filter(Chapter.manga_id == manga_id).count()
-    downloaded = db.query(Chapter).filter(
-        Chapter.manga_id == manga_id,
-        Chapter.status == 'downloaded'
-    ).count()
-    downloading = db.query(Chapter).filter(
-        Chapter.manga_id == manga_id,
-        Chapter.status == 'downloading'
-    ).count()
-    pending = db.query(Chapter).filter(
-        Chapter.manga_id == manga_id,
-        Chapter.status == 'pending'
-    ).count()
-    failed = db.query(Chapter).filter(
-        Chapter.manga_id == manga_id,
-        Chapter.status == 'error'
-    ).count()
-    sent = db.query(Chapter).filter(
-        Chapter.manga_id == manga_id,
-        Chapter.status == 'sent'
-    ).count()
-
-    last_download = db.query(func.max(Chapter.downloaded_at)).filter(
-        Chapter.manga_id == manga_id
-    ).scalar()
+    # All counters in a single pass over the manga's chapters
+    stats = (await db.execute(
+        select(
+            func.count(Chapter.id).label('total'),
+            func.count(Chapter.id).filter(Chapter.status == 'downloaded').label('downloaded'),
+            func.count(Chapter.id).filter(Chapter.status == 'downloading').label('downloading'),
+            func.count(Chapter.id).filter(Chapter.status == 'pending').label('pending'),
+            func.count(Chapter.id).filter(Chapter.status == 'error').label('failed'),
+            func.count(Chapter.id).filter(Chapter.status == 'sent').label('sent'),
+            func.max(Chapter.downloaded_at).label('last_download')
+        ).where(Chapter.manga_id == manga_id)
+    )).one()
 
     return MangaStats(
         manga_id=manga_id,
         title=manga.title,
-        total_chapters=total,
-        downloaded=downloaded,
-        downloading=downloading,
-        pending=pending,
-        failed=failed,
-        sent_to_kindle=sent,
-        last_download=last_download,
+        total_chapters=stats.total,
+        downloaded=stats.downloaded,
+        downloading=stats.downloading,
+        pending=stats.pending,
+        failed=stats.failed,
+        sent_to_kindle=stats.sent,
+        last_download=stats.last_download,
         last_check=manga.last_check
     )
 
 
 @router.get("/{manga_id}/chapters", response_model=List[ChapterResponse])
-def get_manga_chapters(
+async def get_manga_chapters(
     manga_id: int,
     status: Optional[str] = Query(None, description="Filter by status"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all chapters for a manga
     """
-    manga = db.query(Manga).filter(Manga.id == manga_id).first()
+    manga = await db.get(Manga, manga_id)
 
     if not manga:
         raise HTTPException(status_code=404, detail="Manga not found")
 
-    query = db.query(Chapter).filter(Chapter.manga_id == manga_id)
+    query = select(Chapter).options(raiseload('*')).where(Chapter.manga_id == manga_id)
 
     if status:
-        query = query.filter(Chapter.status == status)
+        query = query.where(Chapter.status == status)
 
-    chapters = query.order_by(Chapter.number.asc()).all()
+    chapters = (await db.scalars(query.order_by(Chapter.number.asc()))).all()
 
     return chapters
 
@@ -725,7 +759,7 @@ async def download_chapters(
     manga_id: int,
     request: ChapterDownloadRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Queue specific chapters for download.
@@ -733,18 +767,20 @@ async def download_chapters(
     Automatically deduplicates chapters that share the same download_url
     (bundled volumes) to avoid downloading the same file multiple times.
     """
-    manga = db.query(Manga).filter(Manga.id == manga_id).first()
+    manga = await db.get(Manga, manga_id)
 
     if not manga:
         raise HTTPException(status_code=404, detail="Manga not found")
 
     # Verify all chapter IDs belong to this manga
-    chapters = db.query(Chapter).filter(
-        and_(
-            Chapter.id.in_(request.chapter_ids),
-            Chapter.manga_id == manga_id
+    chapters = (await db.execute(
+        select(Chapter.id, Chapter.status, Chapter.download_url).where(
+            and_(
+                Chapter.id.in_(request.chapter_ids),
+                Chapter.manga_id == manga_id
+            )
         )
-    ).all()
+    )).all()
 
     if len(chapters) != len(request.chapter_ids):
         raise HTTPException(
@@ -753,39 +789,33 @@ async def download_chapters(
         )
 
     # Deduplicar por download_url para evitar descargar el mismo archivo múltiples veces
-    # Si varios capítulos comparten la misma URL (bundle), solo descargamos uno
-    seen_urls = set()
-    chapters_to_download = []
+    # Si varios capítulos comparten la misma URL (bundle), solo descargamos uno.
+    # Un solo recorrido: el primer capítulo de cada URL (o cada capítulo sin URL) se descarga
+    chapters_to_download = {}
     all_chapter_ids = []  # Todos los IDs para marcar como downloading
-    
+
     for chapter in chapters:
-        if chapter.status in ['pending', 'error']:
+        if chapter.status in ('pending', 'error'):
             all_chapter_ids.append(chapter.id)
-            
-            # Solo añadir a la descarga si no hemos visto esta URL
-            if chapter.download_url:
-                if chapter.download_url not in seen_urls:
-                    seen_urls.add(chapter.download_url)
-                    chapters_to_download.append(chapter)
-            else:
-                # Sin URL, incluir siempre
-                chapters_to_download.append(chapter)
-
-    # Marcar TODOS los capítulos seleccionados como 'downloading'
-    # (incluidos los del bundle que no se descargarán directamente)
-    for chapter in chapters:
-        if chapter.id in all_chapter_ids:
-            chapter.status = 'downloading'
-            chapter.retry_count = 0
+            chapters_to_download.setdefault(chapter.download_url or chapter.id, chapter.id)
 
-    db.commit()
+    # Marcar TODOS los capítulos seleccionados como 'downloading' con un único UPDATE
+    # (incluidos los del bundle que no se descargarán directamente)
+    if all_chapter_ids:
+        await db.execute(
+            update(Chapter).where(Chapter.id.in_(all_chapter_ids)).values(
+                status='downloading',
+                retry_count=0
+            )
+        )
+        await db.commit()
 
     # Trigger background download task solo para capítulos únicos por URL
     if chapters_to_download:
         background_tasks.add_task(
-            _process_chapter_downloads, 
-            manga_id, 
-            [c.id for c in chapters_to_download]
+            _process_chapter_downloads,
+            manga_id,
+            list(chapters_to_download.values())
         )
 
     return {
@@ -842,9 +872,7 @@ def _select_best_download_link(download_links: list) -> str:
 
 async def _fetch_chapters_from_source(manga_id: int, source_url: str):
     """Background task to fetch chapters from source"""
-    from app.database import SessionLocal
-
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
         # Detect which scraper to use based on URL
         parsed_url = urlparse(source_url)
@@ -878,12 +906,14 @@ async def _fetch_chapters_from_source(manga_id: int, source_url: str):
             download_host = ch_data.get('download_host', 'unknown')
 
             # Check if chapter already exists
-            existing = db.query(Chapter).filter(
-                and_(
-                    Chapter.manga_id == manga_id,
-                    Chapter.number == ch_data['number']
+            existing = await db.scalar(
+                select(Chapter).where(
+                    and_(
+                        Chapter.manga_id == manga_id,
+                        Chapter.number == ch_data['number']
+                    )
                 )
-            ).first()
+            )
 
             if existing:
                 # Update URLs si los nuevos son mejores
@@ -927,35 +957,29 @@ async def _fetch_chapters_from_source(manga_id: int, source_url: str):
             db.add(chapter)
             chapters_added += 1
 
-        db.commit()
+        await db.commit()
         logger.info(f"Fetched {chapters_added} chapters/volumes for manga {manga_id} from {domain}")
 
     except Exception as e:
         logger.error(f"Error fetching chapters from {source_url}: {e}")
-        db.rollback()
+        await db.rollback()
     finally:
-        db.close()
+        await db.close()
 
 
 async def _refresh_manga_task(manga_id: int):
     """Background task to refresh manga chapters"""
-    from app.database import SessionLocal
+    async with AsyncSessionLocal() as db:
+        source_url = await db.scalar(select(Manga.source_url).where(Manga.id == manga_id))
 
-    db = SessionLocal()
-    try:
-        manga = db.query(Manga).filter(Manga.id == manga_id).first()
-        if not manga or not manga.source_url:
-            return
+    if not source_url:
+        return
 
-        await _fetch_chapters_from_source(manga_id, manga.source_url)
-
-    finally:
-        db.close()
+    await _fetch_chapters_from_source(manga_id, source_url)
 
 
 async def _process_chapter_downloads(manga_id: int, chapter_ids: List[int]):
     """Background task to process chapter downloads"""
-    from app.database import SessionLocal
     from app.services.downloader import MangaDownloader
     import json
     import sys
@@ -964,12 +988,12 @@ async def _process_chapter_downloads(manga_id: int, chapter_ids: List[int]):
     logger.info(f"=== Starting download task for manga {manga_id}, chapters: {chapter_ids} ===")
     sys.stdout.flush()
 
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     try:
         downloader = MangaDownloader()
 
         for chapter_id in chapter_ids:
-            chapter = db.query(Chapter).filter(Chapter.id == chapter_id).first()
+            chapter = await db.get(Chapter, chapter_id)
 
             if not chapter:
                 logger.warning(f"Chapter {chapter_id} not found, skipping")
@@ -982,7 +1006,7 @@ async def _process_chapter_downloads(manga_id: int, chapter_ids: List[int]):
             try:
                 # Update status to downloading
                 chapter.status = 'downloading'
-                db.commit()
+                await db.commit()
                 logger.info(f"Chapter {chapter_id} (Tomo {chapter.number}) - starting download")
 
                 # Download the chapter
@@ -994,12 +1018,12 @@ async def _process_chapter_downloads(manga_id: int, chapter_ids: List[int]):
                     if 'shrinkme' in url_lower:
                         chapter.status = 'error'
                         chapter.error_message = 'Manual download required - ShrinkMe not supported'
-                        db.commit()
+                        await db.commit()
                         logger.warning(f"Chapter {chapter_id} requires manual download: {chapter.download_url}")
                         continue
 
                     # Get manga info for filename
-                    manga = db.query(Manga).filter(Manga.id == chapter.manga_id).first()
+                    manga = await db.get(Manga, chapter.manga_id)
 
                     # Generate filename: MangaTitle - Tomo XXX.cbz
                     filename = f"{manga.slug} - Tomo {int(chapter.number):03d}.cbz"
@@ -1024,7 +1048,7 @@ async def _process_chapter_downloads(manga_id: int, chapter_ids: List[int]):
 
                         # Si este capítulo está en un bundle, marcar todos los capítulos relacionados
                         if chapter.is_bundled and chapter.download_url:
-                            _mark_bundled_chapters_downloaded(
+                            await _mark_bundled_chapters_downloaded(
                                 db, manga.id, chapter.download_url, str(file_path), chapter.id
                             )
                     else:
@@ -1036,7 +1060,7 @@ async def _process_chapter_downloads(manga_id: int, chapter_ids: List[int]):
                     chapter.status = 'error'
                     chapter.error_message = 'No download URL available'
 
-                db.commit()
+                await db.commit()
                 logger.info(f"Chapter {chapter_id} processing complete, status: {chapter.status}")
 
             except Exception as e:
@@ -1044,16 +1068,16 @@ async def _process_chapter_downloads(manga_id: int, chapter_ids: List[int]):
                 chapter.status = 'error'
                 chapter.error_message = str(e)
                 chapter.retry_count += 1
-                db.commit()
+                await db.commit()
 
     except Exception as e:
         logger.error(f"Error in download task: {e}")
     finally:
-        db.close()
+        await db.close()
 
 
-def _mark_bundled_chapters_downloaded(
-    db: Session, manga_id: int, download_url: str, file_path: str, exclude_chapter_id: int
+async def _mark_bundled_chapters_downloaded(
+    db: AsyncSession, manga_id: int, download_url: str, file_path: str, exclude_chapter_id: int
 ):
     """
     Marca todos los capítulos que comparten el mismo download_url como descargados.
@@ -1068,14 +1092,16 @@ def _mark_bundled_chapters_downloaded(
     """
     try:
         # Buscar otros capítulos del mismo manga con el mismo download_url
-        related_chapters = db.query(Chapter).filter(
-            and_(
-                Chapter.manga_id == manga_id,
-                Chapter.download_url == download_url,
-                Chapter.id != exclude_chapter_id,
-                Chapter.status.in_(['pending', 'downloading'])
+        related_chapters = (await db.scalars(
+            select(Chapter).where(
+                and_(
+                    Chapter.manga_id == manga_id,
+                    Chapter.download_url == download_url,
+                    Chapter.id != exclude_chapter_id,
+                    Chapter.status.in_(['pending', 'downloading'])
+                )
             )
-        ).all()
+        )).all()
 
         if related_chapters:
             logger.info(f"Marking {len(related_chapters)} bundled chapters as downloaded")
@@ -1085,7 +1111,7 @@ def _mark_bundled_chapters_downloaded(
                 ch.file_path = file_path  # Mismo archivo para todos
                 ch.downloaded_at = datetime.utcnow()
 
-            db.commit()
+            await db.commit()
             logger.info(f"Bundled chapters marked: {[int(ch.number) for ch in related_chapters]}")
 
     except Exception as e:
@@ -533,8 +533,7 @@ def delete_downloaded_file(chapter_id: int, db: Session = Depends(get_db)):
 
     # Delete converted files (can be multiple for split files)
     if chapter.converted_path:
-        # Handle multiple paths separated by '|'
-        converted_paths = [p.strip() for p in chapter.converted_path.split('|') if p.strip()]
+        converted_paths = [str(p) for p in chapter.converted_file_paths]
 
         for conv_path in converted_paths:
             try:
@@ -549,6 +548,7 @@ def delete_downloaded_file(chapter_id: int, db: Session = Depends(get_db)):
     chapter.status = 'pending'
     chapter.file_path = None
     chapter.converted_path = None
+    chapter.converted_files = None
     chapter.downloaded_at = None
     chapter.converted_at = None
     chapter.sent_at = None
@@ -320,6 +320,7 @@ async def trigger_cleanup(db: Session = Depends(get_db)):
 
             chapter.file_path = None
             chapter.converted_path = None
+            chapter.converted_files = None
 
         db.commit()
 
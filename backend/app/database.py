@@ -3,24 +3,61 @@ Database Configuration and Session Management
 SQLAlchemy setup with PostgreSQL
 """
 
-from sqlalchemy import create_engine
+import logging
+import orjson
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import get_settings
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
+
+def _json_dumps(value) -> str:
+    """Serialize JSON columns with orjson"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# Shared connection pool tuning for the sync and async engines
+POOL_OPTIONS = dict(
+    pool_pre_ping=True,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE
+)
+
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+    **POOL_OPTIONS
 )
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine (asyncpg) for endpoints that must not block the event loop
+async_engine = create_async_engine(
+    make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+    **POOL_OPTIONS
+)
+
+# Create AsyncSessionLocal class
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Create Base class for models
 Base = declarative_base()
 
@@ -37,6 +74,124 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Async database dependency for FastAPI
+    Yields an AsyncSession so queries yield the event loop while waiting
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# create_all() never alters existing tables, so columns added to existing
+# models, foreign key changes, indexes that must exist (the comic_issues
+# upsert target) and the trigger keeping comics.total_issues /
+# downloaded_issues in sync with comic_issues are applied here.
+# Every statement is idempotent and runs on each startup.
+SCHEMA_UPGRADE_DDL = (
+    "ALTER TABLE chapters ADD COLUMN IF NOT EXISTS converted_files JSON",
+    "ALTER TABLE books ADD COLUMN IF NOT EXISTS scrape_status VARCHAR(50)",
+    "ALTER TABLE books ADD COLUMN IF NOT EXISTS scrape_error TEXT",
+    # Chapters are removed with their manga by the database (ON DELETE CASCADE)
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM pg_constraint
+            WHERE conrelid = 'chapters'::regclass
+              AND conname = 'chapters_manga_id_fkey'
+              AND confdeltype <> 'c'
+        ) THEN
+            ALTER TABLE chapters DROP CONSTRAINT chapters_manga_id_fkey;
+            ALTER TABLE chapters ADD CONSTRAINT chapters_manga_id_fkey
+                FOREIGN KEY (manga_id) REFERENCES manga (id) ON DELETE CASCADE;
+        END IF;
+    END
+    $$
+    """,
+    """
+    ALTER TABLE manga ADD COLUMN IF NOT EXISTS search_blob TEXT GENERATED ALWAYS AS (
+        coalesce(title, '') || ' ' || coalesce(title_english, '') || ' ' || coalesce(title_romaji, '')
+    ) STORED
+    """,
+    # Issue upserts use ON CONFLICT (comic_id, comicvine_id), so this index must
+    # exist: drop duplicates left by the old check-then-insert race (keeping a
+    # downloaded row, else the oldest) and create it here, where a failure
+    # stops startup instead of being logged by the index loop below
+    """
+    DELETE FROM comic_issues WHERE id IN (
+        SELECT id FROM (
+            SELECT id, row_number() OVER (
+                PARTITION BY comic_id, comicvine_id
+                ORDER BY (status = 'downloaded') DESC, id
+            ) AS duplicate_rank
+            FROM comic_issues
+            WHERE comicvine_id IS NOT NULL
+        ) AS ranked
+        WHERE duplicate_rank > 1
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS uq_comic_issues_comic_comicvine ON comic_issues (comic_id, comicvine_id)",
+    "ALTER TABLE comics ADD COLUMN IF NOT EXISTS total_issues INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE comics ADD COLUMN IF NOT EXISTS downloaded_issues INTEGER NOT NULL DEFAULT 0",
+    """
+    CREATE OR REPLACE FUNCTION comic_issue_counters() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE comics SET
+                total_issues = total_issues - 1,
+                downloaded_issues = downloaded_issues - CASE WHEN OLD.status = 'downloaded' THEN 1 ELSE 0 END
+            WHERE id = OLD.comic_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            UPDATE comics SET
+                total_issues = total_issues + 1,
+                downloaded_issues = downloaded_issues + CASE WHEN NEW.status = 'downloaded' THEN 1 ELSE 0 END
+            WHERE id = NEW.comic_id;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS comic_issues_counters ON comic_issues",
+    """
+    CREATE TRIGGER comic_issues_counters
+    AFTER INSERT OR DELETE OR UPDATE OF comic_id, status ON comic_issues
+    FOR EACH ROW EXECUTE FUNCTION comic_issue_counters()
+    """,
+    # Backfill (and repair any drift) without touching rows that are already right
+    """
+    UPDATE comics SET total_issues = counts.total, downloaded_issues = counts.downloaded
+    FROM (
+        SELECT comics.id,
+               COUNT(comic_issues.id) AS total,
+               COUNT(comic_issues.id) FILTER (WHERE comic_issues.status = 'downloaded') AS downloaded
+        FROM comics LEFT JOIN comic_issues ON comic_issues.comic_id = comics.id
+        GROUP BY comics.id
+    ) AS counts
+    WHERE comics.id = counts.id
+      AND (comics.total_issues, comics.downloaded_issues) IS DISTINCT FROM (counts.total, counts.downloaded)
+    """,
+)
+
+
 def init_db():
     """Initialize database tables"""
+    # Extensions required by indexes (trigram GIN indexes for ILIKE search)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
     Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        for statement in SCHEMA_UPGRADE_DDL:
+            conn.execute(text(statement))
+
+    # create_all() skips tables that already exist, so create any index
+    # added to the models after the table was first created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                logger.warning(f"Could not create index {index.name}: {e}")
@@ -11,7 +11,7 @@ import logging
 import sys
 
 from app.config import get_settings
-from app.database import init_db
+from app.database import init_db, async_engine
 from app.api.v1 import api_router
 from app.services.scheduler import MangaScheduler
 
@@ -74,6 +74,15 @@ async def lifespan(app: FastAPI):
         scheduler.stop()
         logger.info("Scheduler stopped")
 
+    from app.services.book_scrapers.playwright_scraper import close_playwright_scraper
+    await close_playwright_scraper()
+    logger.info("Playwright browser closed")
+
+    from app.services.anilist import close_anilist_service
+    await close_anilist_service()
+
+    await async_engine.dispose()
+
 
 # Create FastAPI app
 app = FastAPI(
@@ -93,6 +102,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Cache"],
 )
 
 
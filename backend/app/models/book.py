@@ -4,16 +4,24 @@ Represents a book or book series being monitored
 Integrated with Google Books/Open Library for metadata
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, JSON, Index, select, func, text
+from sqlalchemy.orm import relationship, column_property
 from datetime import datetime
 from app.database import Base
+from app.models.book_chapter import BookChapter
 
 
 class Book(Base):
     """Book model for storing book information with metadata"""
 
     __tablename__ = "books"
+    __table_args__ = (
+        # Trigram indexes so the library's ILIKE '%term%' search can use an index
+        Index("ix_books_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_books_title_original_trgm", "title_original", postgresql_using="gin", postgresql_ops={"title_original": "gin_trgm_ops"}),
+        # One book per Open Library work (membership lookups by external ID)
+        Index("ux_books_openlibrary_id", "openlibrary_id", unique=True, postgresql_where=text("openlibrary_id IS NOT NULL")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -23,7 +31,7 @@ class Book(Base):
 
     # Metadata source integration
     google_books_id = Column(String(100), unique=True, index=True)  # Google Books volume ID
-    openlibrary_id = Column(String(100), index=True)  # Open Library work ID
+    openlibrary_id = Column(String(100))  # Open Library work ID (unique, see __table_args__)
     isbn_10 = Column(String(20))  # ISBN-10
     isbn_13 = Column(String(20), index=True)  # ISBN-13
 
@@ -58,6 +66,10 @@ class Book(Base):
     source_urls = Column(JSON)  # Dict of {scraper_name: url}
     preferred_source = Column(String(50))  # Preferred scraper
 
+    # Books added from a scraper URL are filled in by a background task
+    scrape_status = Column(String(50))  # pending_scrape, scrape_failed; NULL once scraped
+    scrape_error = Column(Text)
+
     # System fields
     monitored = Column(Boolean, default=True, index=True)
     auto_download = Column(Boolean, default=True)
@@ -70,18 +82,27 @@ class Book(Base):
         "BookChapter",
         back_populates="book",
         cascade="all, delete-orphan",
-        lazy="dynamic"
+        order_by=BookChapter.number
+    )
+
+    # Computed counters - correlated COUNT subqueries, deferred so only the
+    # queries that need them pay for them (use undefer_group("chapter_counts"))
+    total_chapters = column_property(
+        select(func.count(BookChapter.id))
+        .where(BookChapter.book_id == id)
+        .correlate_except(BookChapter)
+        .scalar_subquery(),
+        deferred=True,
+        group="chapter_counts"
+    )
+    downloaded_chapters = column_property(
+        select(func.count(BookChapter.id))
+        .where(BookChapter.book_id == id, BookChapter.status == "downloaded")
+        .correlate_except(BookChapter)
+        .scalar_subquery(),
+        deferred=True,
+        group="chapter_counts"
     )
 
     def __repr__(self):
         return f"<Book(id={self.id}, title='{self.title}', monitored={self.monitored})>"
-
-    @property
-    def total_chapters(self):
-        """Get total number of chapters (EPUB files)"""
-        return self.chapters.count()
-
-    @property
-    def downloaded_chapters(self):
-        """Get number of downloaded chapters"""
-        return self.chapters.filter_by(status="downloaded").count()
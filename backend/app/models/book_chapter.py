@@ -3,7 +3,7 @@ BookChapter Model
 Represents individual book files (EPUBs)
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -13,6 +13,11 @@ class BookChapter(Base):
     """BookChapter model - represents a single EPUB file"""
 
     __tablename__ = "book_chapters"
+    __table_args__ = (
+        # Chapter listings (ordered by number) and per-status counts of a book
+        Index("ix_book_chapters_book_number", "book_id", "number"),
+        Index("ix_book_chapters_book_status", "book_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     book_id = Column(Integer, ForeignKey("books.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -3,19 +3,55 @@ Chapter Model
 Represents individual manga chapters
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, Text, JSON, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Tuple
 from app.database import Base
 
 
+@lru_cache(maxsize=1024)
+def _split_converted_path(converted_path: str) -> Tuple[Path, ...]:
+    """Parse a '|'-separated converted_path once; the string rarely changes"""
+    return tuple(Path(p.strip()) for p in converted_path.split('|') if p.strip())
+
+
+def converted_paths_of(converted_files, converted_path) -> Tuple[Path, ...]:
+    """Paths of a chapter's converted file(s) from its converted_files / converted_path columns"""
+    # converted_path always mirrors converted_files (see set_converted_files),
+    # and as a string it can key the parse cache
+    if converted_path:
+        return _split_converted_path(converted_path)
+    if converted_files:
+        return tuple(Path(f["path"]) for f in converted_files)
+    return ()
+
+
 class Chapter(Base):
     """Chapter model for storing manga chapter information"""
 
     __tablename__ = "chapters"
+    __table_args__ = (
+        # Chapter listings of a manga are ordered by number
+        Index("ix_chapters_manga_id_number", "manga_id", "number"),
+        # Kindle listings only read converted chapters
+        Index(
+            "ix_chapters_converted_manga_id_number", "manga_id", "number",
+            postgresql_where=text("converted_path IS NOT NULL")
+        ),
+        # Per-manga status counters can be answered from the index alone
+        Index("ix_chapters_manga_id_status", "manga_id", "status"),
+        # Pending counts (library stats, download queue) only touch pending rows
+        Index(
+            "ix_chapters_pending_manga_id", "manga_id",
+            postgresql_where=text("status = 'pending'")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    manga_id = Column(Integer, ForeignKey("manga.id"), nullable=False, index=True)
+    manga_id = Column(Integer, ForeignKey("manga.id", ondelete="CASCADE"), nullable=False, index=True)
     number = Column(Float, nullable=False)  # Supports 1, 1.5, 2, etc
     title = Column(String(255))
     url = Column(String(500), nullable=False)
@@ -34,6 +70,7 @@ class Chapter(Base):
     # File paths
     file_path = Column(String(500))  # Original CBZ file
     converted_path = Column(String(500))  # Converted EPUB file
+    converted_files = Column(JSON)  # [{"path": str, "size": bytes}] one entry per (split) part
 
     # Timestamps
     downloaded_at = Column(DateTime)
@@ -51,6 +88,16 @@ class Chapter(Base):
     def __repr__(self):
         return f"<Chapter(id={self.id}, manga_id={self.manga_id}, number={self.number}, status='{self.status}')>"
 
+    @property
+    def converted_file_paths(self) -> Tuple[Path, ...]:
+        """Paths of the converted file(s), in part order"""
+        return converted_paths_of(self.converted_files, self.converted_path)
+
+    def set_converted_files(self, paths: List[Path]):
+        """Record the converted file(s) along with their sizes"""
+        self.converted_path = '|'.join(str(p) for p in paths) if paths else None
+        self.converted_files = [{"path": str(p), "size": p.stat().st_size} for p in paths] or None
+
     @property
     def is_downloaded(self):
         """Check if chapter is downloaded"""
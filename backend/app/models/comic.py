@@ -4,7 +4,7 @@ Represents a comic series (American comics) being monitored
 Integrated with ComicVine API for metadata
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, JSON, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -14,6 +14,17 @@ class Comic(Base):
     """Comic model for storing comic series information with ComicVine metadata"""
 
     __tablename__ = "comics"
+    __table_args__ = (
+        # (sort column, id) pairs for keyset pagination of the library
+        Index("ix_comics_title_id", "title", "id"),
+        Index("ix_comics_created_at_id", "created_at", "id"),
+        Index("ix_comics_start_year_id", "start_year", "id"),
+        # Trigram indexes so the library's ILIKE '%term%' filters can use an index
+        Index("ix_comics_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index("ix_comics_publisher_trgm", "publisher", postgresql_using="gin", postgresql_ops={"publisher": "gin_trgm_ops"}),
+        # Monitored comics are the common filter (library view, scheduler)
+        Index("ix_comics_monitored_true", "id", postgresql_where=text("monitored")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -36,6 +47,10 @@ class Comic(Base):
     publisher = Column(String(200))  # Marvel, DC, Image, etc.
     start_year = Column(Integer)  # Year started
     count_of_issues = Column(Integer)  # Total issues in volume
+
+    # Issue counters, maintained by a trigger on comic_issues (see init_db)
+    total_issues = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    downloaded_issues = Column(Integer, nullable=False, default=0, server_default=text("0"))
     
     # Categories and ratings
     genres = Column(JSON)  # Array of genres
@@ -65,27 +80,26 @@ class Comic(Base):
         "ComicIssue",
         back_populates="comic",
         cascade="all, delete-orphan",
-        lazy="dynamic"
+        # Never loaded implicitly (not possible under AsyncSession); issues are
+        # queried explicitly and removed by the ON DELETE CASCADE foreign key
+        lazy="write_only",
+        passive_deletes=True
     )
 
     def __repr__(self):
         return f"<Comic(id={self.id}, title='{self.title}', publisher='{self.publisher}')>"
 
-    @property
-    def total_issues(self):
-        """Get total number of issues in library"""
-        return self.issues.count()
-
-    @property
-    def downloaded_issues(self):
-        """Get number of downloaded issues"""
-        return self.issues.filter_by(status="downloaded").count()
-
 
 class ComicIssue(Base):
     """Comic Issue model - represents a single issue of a comic series"""
 
     __tablename__ = "comic_issues"
+    __table_args__ = (
+        # One row per ComicVine issue within a comic (target of ON CONFLICT upserts)
+        Index("uq_comic_issues_comic_comicvine", "comic_id", "comicvine_id", unique=True),
+        # Issue listings filter by comic and order by issue number
+        Index("ix_comic_issues_comic_issue_number", "comic_id", "issue_number"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     comic_id = Column(Integer, ForeignKey("comics.id", ondelete="CASCADE"), nullable=False, index=True)
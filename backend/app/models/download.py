@@ -3,7 +3,7 @@ Download Queue Model
 Manages download queue for chapters
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from datetime import datetime
 from app.database import Base
 
@@ -12,6 +12,10 @@ class DownloadQueue(Base):
     """Download queue model for managing chapter downloads (manga and books)"""
 
     __tablename__ = "download_queue"
+    __table_args__ = (
+        # Duplicate check when queueing book chapters
+        Index("ix_download_queue_book_chapter_status", "book_chapter_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -4,7 +4,7 @@ Represents a manga series being monitored
 Enhanced with Anilist metadata integration
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, JSON
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float, JSON, Index, Computed
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -14,6 +14,10 @@ class Manga(Base):
     """Manga model for storing manga series information with Anilist metadata"""
 
     __tablename__ = "manga"
+    __table_args__ = (
+        # Trigram index so the library's ILIKE '%term%' search is a single index probe
+        Index("ix_manga_search_blob_trgm", "search_blob", postgresql_using="gin", postgresql_ops={"search_blob": "gin_trgm_ops"}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
 
@@ -34,6 +38,13 @@ class Manga(Base):
     title_english = Column(String(500))
     title_native = Column(String(500))
 
+    # All titles in one generated column, searched with a single ILIKE
+    # (keep in sync with the ALTER TABLE in database.SCHEMA_UPGRADE_DDL)
+    search_blob = Column(Text, Computed(
+        "coalesce(title, '') || ' ' || coalesce(title_english, '') || ' ' || coalesce(title_romaji, '')",
+        persisted=True
+    ))
+
     # Rich metadata from Anilist
     description = Column(Text)
     cover_image = Column(String(500))  # Main cover
@@ -85,18 +96,12 @@ class Manga(Base):
         "Chapter",
         back_populates="manga",
         cascade="all, delete-orphan",
-        lazy="dynamic"
+        # Never loaded implicitly (not possible under AsyncSession); chapters are
+        # queried explicitly, counted with aggregate queries and removed by the
+        # ON DELETE CASCADE foreign key
+        lazy="write_only",
+        passive_deletes=True
     )
 
     def __repr__(self):
         return f"<Manga(id={self.id}, title='{self.title}', monitored={self.monitored})>"
-
-    @property
-    def total_chapters(self):
-        """Get total number of chapters"""
-        return self.chapters.count()
-
-    @property
-    def downloaded_chapters(self):
-        """Get number of downloaded chapters"""
-        return self.chapters.filter_by(status="downloaded").count()
@@ -136,6 +136,8 @@ class BookResponse(BaseModel):
     ratings_count: Optional[int] = None
     source_urls: Optional[dict] = None
     preferred_source: Optional[str] = None
+    scrape_status: Optional[str] = None
+    scrape_error: Optional[str] = None
     monitored: bool
     auto_download: bool
     created_at: datetime
@@ -15,9 +15,16 @@ from app.services.translator import (
     translate_format,
     get_translator
 )
+from app.utils.cache import async_ttl_cache
 
 logger = logging.getLogger(__name__)
 
+# Search and discover pages are re-requested while paginating; AniList
+# rate-limits at 90 requests per minute, so keep results for a minute
+CACHE_TTL = 60
+# Manga details barely change; re-adding or retrying an add reuses them
+MEDIA_CACHE_TTL = 3600
+
 
 class AnilistService:
     """
@@ -148,6 +155,32 @@ class AnilistService:
     }
     """
 
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session, so requests reuse pooled keep-alive connections"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers={
+                    'Content-Type': 'application/json',
+                    'Accept': 'application/json',
+                },
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the HTTP session"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    @async_ttl_cache(
+        ttl=CACHE_TTL,
+        maxsize=512,
+        key=lambda query, page=1, per_page=20: (query.strip().lower(), page, per_page),
+        cache_if=lambda result: bool(result['pageInfo'])
+    )
     async def search_manga(
         self,
         query: str,
@@ -193,6 +226,7 @@ class AnilistService:
             logger.error(f"Error searching Anilist: {e}")
             return {'results': [], 'pageInfo': {}}
 
+    @async_ttl_cache(ttl=MEDIA_CACHE_TTL, key=lambda anilist_id: anilist_id)
     async def get_manga_by_id(self, anilist_id: int) -> Optional[Dict]:
         """
         Get detailed manga information by Anilist ID
@@ -230,24 +264,19 @@ class AnilistService:
             API response
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.API_URL,
-                    json={
-                        'query': query,
-                        'variables': variables
-                    },
-                    headers={
-                        'Content-Type': 'application/json',
-                        'Accept': 'application/json',
-                    },
-                    timeout=aiohttp.ClientTimeout(total=15)
-                ) as response:
-                    if response.status != 200:
-                        logger.error(f"Anilist API error: HTTP {response.status}")
-                        return None
-
-                    return await response.json()
+            session = await self._get_session()
+            async with session.post(
+                self.API_URL,
+                json={
+                    'query': query,
+                    'variables': variables
+                }
+            ) as response:
+                if response.status != 200:
+                    logger.error(f"Anilist API error: HTTP {response.status}")
+                    return None
+
+                return await response.json()
 
         except asyncio.TimeoutError:
             logger.error("Anilist API timeout")
@@ -385,6 +414,7 @@ class AnilistService:
 
         return result
 
+    @async_ttl_cache(ttl=CACHE_TTL, key=lambda page=1, per_page=20: (page, per_page), cache_if=bool)
     async def get_trending_manga(self, page: int = 1, per_page: int = 20) -> List[Dict]:
         """
         Get trending manga from Anilist
@@ -442,6 +472,7 @@ class AnilistService:
             logger.error(f"Error fetching trending manga: {e}")
             return []
 
+    @async_ttl_cache(ttl=CACHE_TTL, key=lambda page=1, per_page=20: (page, per_page), cache_if=bool)
     async def get_popular_manga(self, page: int = 1, per_page: int = 20) -> List[Dict]:
         """
         Get popular manga from Anilist
@@ -496,3 +527,21 @@ class AnilistService:
         except Exception as e:
             logger.error(f"Error fetching popular manga: {e}")
             return []
+
+
+# Singleton instance
+_anilist_service: Optional[AnilistService] = None
+
+
+def get_anilist_service() -> AnilistService:
+    """Get Anilist service singleton"""
+    global _anilist_service
+    if _anilist_service is None:
+        _anilist_service = AnilistService()
+    return _anilist_service
+
+
+async def close_anilist_service():
+    """Close the singleton's HTTP session (application shutdown)"""
+    if _anilist_service is not None:
+        await _anilist_service.close()
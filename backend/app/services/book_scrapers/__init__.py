@@ -3,12 +3,13 @@ Book Scrapers Package
 """
 
 from .base import BookScraperBase, BookScraperResult, DownloadLink, HostType
-from .lectulandia import LectulandiaScraper
+from .lectulandia import LectulandiaScraper, get_lectulandia_scraper
 
 __all__ = [
     'BookScraperBase',
     'BookScraperResult',
     'DownloadLink',
     'HostType',
-    'LectulandiaScraper'
+    'LectulandiaScraper',
+    'get_lectulandia_scraper'
 ]
@@ -4,13 +4,31 @@ Scrapes books from lectulandia.co
 """
 
 import aiohttp
+import asyncio
 import logging
 from bs4 import BeautifulSoup
-from typing import List, Dict
+from typing import List, Dict, Optional
+from app.utils.cache import TTLCache
 from .base import BookScraperBase, BookScraperResult
 
 logger = logging.getLogger(__name__)
 
+# Max simultaneous requests against lectulandia (stays under its rate limit)
+MAX_CONCURRENT_REQUESTS = 4
+MAX_RETRIES = 4
+
+_request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+# url -> (etag, last_modified, html) for conditional revalidation of book pages
+_page_validators = TTLCache(ttl=24 * 3600, maxsize=256)
+
+
+def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+    """Seconds to wait before retrying: Retry-After header or exponential backoff"""
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return float(2 ** attempt)
+
 
 class LectulandiaScraper(BookScraperBase):
     """Scraper for lectulandia.co"""
@@ -23,7 +41,6 @@ class LectulandiaScraper(BookScraperBase):
         try:
             # Import Playwright scraper
             from .playwright_scraper import get_playwright_scraper
-            import asyncio
 
             logger.info(f"Lectulandia: Searching with Playwright for '{query}'")
             playwright_scraper = await get_playwright_scraper()
@@ -31,84 +48,88 @@ class LectulandiaScraper(BookScraperBase):
             # Use Playwright to get more complete results
             search_url = f"{self.base_url}/page/{page}/?s={query}"
 
-            page_obj = await playwright_scraper._create_page()
-            await page_obj.goto(search_url, wait_until='networkidle', timeout=30000)
-            await asyncio.sleep(2)  # Wait for JS to load
-
-            # Get all book links
-            book_links = await page_obj.query_selector_all('a[href*="/book/"]')
-            logger.info(f"Found {len(book_links)} book links")
-
-            results = []
-            seen_urls = set()
-
-            for idx, link in enumerate(book_links):
+            async with _request_semaphore:
+                page_obj = await playwright_scraper._create_page()
                 try:
-                    href = await link.get_attribute('href')
-                    if not href or '/book/' not in href:
-                        logger.debug(f"Link {idx}: Skipped - no href or '/book/' not in href")
-                        continue
-
-                    # Skip non-book links
-                    if href == '/book/' or href.endswith('/autor/') or href.endswith('/serie/'):
-                        logger.debug(f"Link {idx}: Skipped - non-book link ({href})")
-                        continue
+                    await page_obj.goto(search_url, wait_until='networkidle', timeout=30000)
+                    await asyncio.sleep(2)  # Wait for JS to load
 
-                    # Make URL absolute
-                    url = href if href.startswith('http') else f"{self.base_url}{href}"
+                    # Get all book links
+                    book_links = await page_obj.query_selector_all('a[href*="/book/"]')
+                    logger.info(f"Found {len(book_links)} book links")
 
-                    # Get title FIRST (before checking duplicates)
-                    # Lectulandia has duplicate links: one without text (image link), one with text (title link)
-                    # We want to keep the one WITH text, so we get title first and skip if empty
-                    title = ''
-                    try:
-                        title = (await link.text_content()) or ''
-                    except Exception as e:
-                        logger.debug(f"Link {idx}: Error getting text_content: {e}")
+                    results = []
+                    seen_urls = set()
 
-                    title = title.strip()
-
-                    # If no text, try to get from img alt attribute
-                    if not title:
+                    for idx, link in enumerate(book_links):
                         try:
+                            href = await link.get_attribute('href')
+                            if not href or '/book/' not in href:
+                                logger.debug(f"Link {idx}: Skipped - no href or '/book/' not in href")
+                                continue
+
+                            # Skip non-book links
+                            if href == '/book/' or href.endswith('/autor/') or href.endswith('/serie/'):
+                                logger.debug(f"Link {idx}: Skipped - non-book link ({href})")
+                                continue
+
+                            # Make URL absolute
+                            url = href if href.startswith('http') else f"{self.base_url}{href}"
+
+                            # Get title FIRST (before checking duplicates)
+                            # Lectulandia has duplicate links: one without text (image link), one with text (title link)
+                            # We want to keep the one WITH text, so we get title first and skip if empty
+                            title = ''
+                            try:
+                                title = (await link.text_content()) or ''
+                            except Exception as e:
+                                logger.debug(f"Link {idx}: Error getting text_content: {e}")
+
+                            title = title.strip()
+
+                            # If no text, try to get from img alt attribute
+                            if not title:
+                                try:
+                                    img = await link.query_selector('img')
+                                    if img:
+                                        title = (await img.get_attribute('alt')) or ''
+                                        title = title.strip()
+                                except Exception as e:
+                                    logger.debug(f"Link {idx}: Error getting img alt: {e}")
+
+                            # Skip if no title (these are usually image links that will have a duplicate title link)
+                            if not title:
+                                logger.debug(f"Link {idx}: Skipped - no title found for URL: {url}")
+                                continue
+
+                            # NOW check for duplicates (after we know this link has a title)
+                            if url in seen_urls:
+                                logger.debug(f"Link {idx}: Skipped - duplicate URL ({url})")
+                                continue
+                            seen_urls.add(url)
+
+                            # Get cover
                             img = await link.query_selector('img')
-                            if img:
-                                title = (await img.get_attribute('alt')) or ''
-                                title = title.strip()
-                        except Exception as e:
-                            logger.debug(f"Link {idx}: Error getting img alt: {e}")
+                            cover = await img.get_attribute('src') if img else None
 
-                    # Skip if no title (these are usually image links that will have a duplicate title link)
-                    if not title:
-                        logger.debug(f"Link {idx}: Skipped - no title found for URL: {url}")
-                        continue
+                            logger.info(f"Link {idx}: Added - {title}")
 
-                    # NOW check for duplicates (after we know this link has a title)
-                    if url in seen_urls:
-                        logger.debug(f"Link {idx}: Skipped - duplicate URL ({url})")
-                        continue
-                    seen_urls.add(url)
-
-                    # Get cover
-                    img = await link.query_selector('img')
-                    cover = await img.get_attribute('src') if img else None
-
-                    logger.info(f"Link {idx}: Added - {title}")
-
-                    results.append({
-                        'title': title,
-                        'url': url,
-                        'cover': cover,
-                        'source': self.name
-                    })
+                            results.append({
+                                'title': title,
+                                'url': url,
+                                'cover': cover,
+                                'source': self.name
+                            })
 
-                except Exception as e:
-                    logger.debug(f"Link {idx}: Error parsing link: {e}")
-                    continue
+                        except Exception as e:
+                            logger.debug(f"Link {idx}: Error parsing link: {e}")
+                            continue
+                finally:
+                    # Also runs when the search is cancelled (e.g. an unneeded prefetch)
+                    await page_obj.close()
 
-            await page_obj.close()
-            logger.info(f"Lectulandia: Found {len(results)} unique results")
-            return results
+                logger.info(f"Lectulandia: Found {len(results)} unique results")
+                return results
 
         except Exception as e:
             logger.error(f"Lectulandia Playwright search error: {e}")
@@ -123,7 +144,8 @@ class LectulandiaScraper(BookScraperBase):
             # Use Playwright scraper for Lectulandia since it requires JS execution
             logger.info(f"Lectulandia: Using Playwright scraper for {url}")
             playwright_scraper = await get_playwright_scraper()
-            result = await playwright_scraper.scrape_lectulandia(url)
+            async with _request_semaphore:
+                result = await playwright_scraper.scrape_lectulandia(url)
 
             # If Playwright succeeded, return its result
             if result.success:
@@ -132,14 +154,49 @@ class LectulandiaScraper(BookScraperBase):
             # Fallback: Try basic scraping if Playwright fails
             logger.warning("Lectulandia: Playwright failed, trying fallback...")
 
+            html = None
+            hit, cached = _page_validators.get(url)
+            headers = {}
+            if hit:
+                etag, last_modified, _ = cached
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+
             async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                    if response.status != 200:
-                        return BookScraperResult(
-                            title="Unknown", source=self.name, source_url=url,
-                            success=False, error=f"HTTP {response.status}"
-                        )
-                    html = await response.text()
+                for attempt in range(MAX_RETRIES):
+                    async with _request_semaphore:
+                        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                            status = response.status
+                            retry_after = response.headers.get('Retry-After')
+                            if status == 200:
+                                html = await response.text()
+                                etag = response.headers.get('ETag')
+                                last_modified = response.headers.get('Last-Modified')
+                                if etag or last_modified:
+                                    _page_validators.set(url, (etag, last_modified, html))
+
+                    if status == 304 and hit:
+                        # Unchanged since last visit: reuse the cached body
+                        logger.info(f"Lectulandia: {url} not modified, using cached page")
+                        html = cached[2]
+                        break
+
+                    if status == 200:
+                        break
+
+                    # Back off on rate limiting / temporary unavailability
+                    if status in (429, 503) and attempt < MAX_RETRIES - 1:
+                        delay = _retry_delay(retry_after, attempt)
+                        logger.warning(f"Lectulandia: HTTP {status}, retrying in {delay:.0f}s")
+                        await asyncio.sleep(delay)
+                        continue
+
+                    return BookScraperResult(
+                        title="Unknown", source=self.name, source_url=url,
+                        success=False, error=f"HTTP {status}"
+                    )
 
             soup = BeautifulSoup(html, 'html.parser')
 
@@ -182,3 +239,15 @@ class LectulandiaScraper(BookScraperBase):
                 title="Unknown", source=self.name, source_url=url,
                 success=False, error=str(e)
             )
+
+
+# Singleton instance
+_lectulandia_scraper = None
+
+
+def get_lectulandia_scraper() -> LectulandiaScraper:
+    """Get Lectulandia scraper singleton"""
+    global _lectulandia_scraper
+    if _lectulandia_scraper is None:
+        _lectulandia_scraper = LectulandiaScraper()
+    return _lectulandia_scraper
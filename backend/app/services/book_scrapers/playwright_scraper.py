@@ -12,6 +12,9 @@ from .base import BookScraperBase, BookScraperResult, DownloadLink, HostType
 
 logger = logging.getLogger(__name__)
 
+# Páginas pre-calentadas reutilizadas por las descargas de libros
+PAGE_POOL_SIZE = 3
+
 
 class PlaywrightBookScraper(BookScraperBase):
     """
@@ -23,22 +26,28 @@ class PlaywrightBookScraper(BookScraperBase):
         super().__init__()
         self.browser: Optional[Browser] = None
         self._playwright = None
+        self._browser_lock = asyncio.Lock()
+        self._page_pool: Optional[asyncio.Queue] = None
 
     async def _ensure_browser(self):
-        """Inicializa el navegador si no está activo"""
-        if self.browser is None:
-            self._playwright = await async_playwright().start()
-            self.browser = await self._playwright.chromium.launch(
-                headless=True,
-                args=[
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-gpu',
-                    '--disable-blink-features=AutomationControlled',
-                ]
-            )
-            logger.info("Playwright book scraper browser initialized")
+        """Inicializa el navegador si no está activo (una sola vez por proceso)"""
+        if self.browser is not None:
+            return
+
+        async with self._browser_lock:
+            if self.browser is None:
+                self._playwright = await async_playwright().start()
+                self.browser = await self._playwright.chromium.launch(
+                    headless=True,
+                    args=[
+                        '--no-sandbox',
+                        '--disable-setuid-sandbox',
+                        '--disable-dev-shm-usage',
+                        '--disable-gpu',
+                        '--disable-blink-features=AutomationControlled',
+                    ]
+                )
+                logger.info("Playwright book scraper browser initialized")
 
     async def _create_page(self) -> Page:
         """Crea una nueva página con configuración stealth"""
@@ -57,8 +66,36 @@ class PlaywrightBookScraper(BookScraperBase):
 
         return page
 
+    async def acquire_page(self) -> Page:
+        """
+        Toma una página del pool compartido (se crea en el primer uso)
+        Devolverla siempre con release_page()
+        """
+        if self._page_pool is None:
+            self._page_pool = asyncio.Queue()
+            for _ in range(PAGE_POOL_SIZE):
+                self._page_pool.put_nowait(await self._create_page())
+
+        return await self._page_pool.get()
+
+    async def release_page(self, page: Page):
+        """Devuelve una página al pool, sustituyéndola si quedó inutilizable"""
+        try:
+            await page.goto('about:blank')
+        except Exception as e:
+            logger.debug(f"Discarding pooled page: {e}")
+            try:
+                await page.context.close()
+            except Exception:
+                pass
+            page = await self._create_page()
+
+        if self._page_pool is not None:
+            self._page_pool.put_nowait(page)
+
     async def close(self):
         """Cierra el navegador"""
+        self._page_pool = None
         if self.browser:
             await self.browser.close()
             self.browser = None
@@ -489,3 +526,9 @@ async def get_playwright_scraper() -> PlaywrightBookScraper:
     if _playwright_scraper_instance is None:
         _playwright_scraper_instance = PlaywrightBookScraper()
     return _playwright_scraper_instance
+
+
+async def close_playwright_scraper():
+    """Cierra el navegador compartido (usado en el shutdown de la app)"""
+    if _playwright_scraper_instance is not None:
+        await _playwright_scraper_instance.close()
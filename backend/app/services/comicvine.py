@@ -7,13 +7,34 @@ https://comicvine.gamespot.com/api/
 import aiohttp
 import asyncio
 import logging
+import math
 import os
 import re
-from typing import List, Dict, Optional
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple
 from urllib.parse import quote
+from app.utils.cache import async_ttl_cache
 
 logger = logging.getLogger(__name__)
 
+# ComicVine allows 200 requests per resource per hour, so keep results for 10 minutes
+CACHE_TTL = 600
+# Volume details rarely change; refresh_comic_metadata invalidates them explicitly
+VOLUME_CACHE_TTL = 3600
+
+
+@dataclass(slots=True)
+class VolumeSearchItem:
+    """Volume as listed in search results (lighter than the detail dict)"""
+    comicvine_id: int
+    title: str
+    description: Optional[str] = None
+    cover_image: Optional[str] = None
+    publisher: Optional[str] = None
+    start_year: Optional[int] = None
+    count_of_issues: Optional[int] = None
+    comicvine_url: Optional[str] = None
+
 
 class ComicVineService:
     """
@@ -25,12 +46,18 @@ class ComicVineService:
     """
 
     API_URL = "https://comicvine.gamespot.com/api"
+    MAX_CONCURRENT_PAGES = 4
     
     def __init__(self, api_key: str = None):
         self.api_key = api_key or os.getenv("COMICVINE_API_KEY", "")
         if not self.api_key:
             logger.warning("ComicVine API key not configured. Set COMICVINE_API_KEY env var.")
     
+    @async_ttl_cache(
+        ttl=CACHE_TTL,
+        key=lambda query, page=1, per_page=20: (query.strip().lower(), page, per_page),
+        cache_if=lambda result: not result.get('error')
+    )
     async def search_volumes(
         self,
         query: str,
@@ -46,7 +73,7 @@ class ComicVineService:
             per_page: Results per page (max 100)
             
         Returns:
-            Dict with search results and pagination info
+            Dict with search results (VolumeSearchItem list) and pagination info
         """
         if not self.api_key:
             return {'results': [], 'total': 0, 'error': 'API key not configured'}
@@ -69,7 +96,7 @@ class ComicVineService:
                 logger.error(f"ComicVine search error: {error}")
                 return {'results': [], 'total': 0, 'error': error}
             
-            results = [self._transform_volume(vol) for vol in data.get('results', [])]
+            results = [self._transform_search_item(vol) for vol in data.get('results', [])]
             
             return {
                 'results': results,
@@ -82,6 +109,7 @@ class ComicVineService:
             logger.error(f"Error searching ComicVine: {e}")
             return {'results': [], 'total': 0, 'error': str(e)}
     
+    @async_ttl_cache(ttl=VOLUME_CACHE_TTL, key=lambda volume_id: volume_id)
     async def get_volume(self, volume_id: int) -> Optional[Dict]:
         """
         Get detailed volume information by ComicVine ID
@@ -157,8 +185,45 @@ class ComicVineService:
         Returns:
             List of issues
         """
+        issues, _ = await self._get_volume_issues_page(volume_id, page, per_page)
+        return issues
+    
+    async def get_all_volume_issues(self, volume_id: int) -> List[Dict]:
+        """
+        Get every issue of a volume
+        
+        The first page tells how many issues exist; the remaining pages are
+        then fetched concurrently (at most MAX_CONCURRENT_PAGES at a time).
+        
+        Args:
+            volume_id: ComicVine volume ID
+            
+        Returns:
+            List of issues in issue number order
+        """
+        per_page = 100
+        issues, total = await self._get_volume_issues_page(volume_id, 1, per_page)
+        
+        pages = math.ceil(total / per_page)
+        if pages <= 1:
+            return issues
+        
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_PAGES)
+        
+        async def fetch(page: int) -> List[Dict]:
+            async with semaphore:
+                page_issues, _ = await self._get_volume_issues_page(volume_id, page, per_page)
+                return page_issues
+        
+        for page_issues in await asyncio.gather(*[fetch(page) for page in range(2, pages + 1)]):
+            issues.extend(page_issues)
+        
+        return issues
+    
+    async def _get_volume_issues_page(self, volume_id: int, page: int, per_page: int) -> Tuple[List[Dict], int]:
+        """Fetch one page of a volume's issues, returning (issues, total issue count)"""
         if not self.api_key:
-            return []
+            return [], 0
             
         try:
             params = {
@@ -174,13 +239,14 @@ class ComicVineService:
             data = await self._make_request('/issues/', params)
             
             if not data or data.get('status_code') != 1:
-                return []
+                return [], 0
             
-            return [self._transform_issue(issue) for issue in data.get('results', [])]
+            issues = [self._transform_issue(issue) for issue in data.get('results', [])]
+            return issues, data.get('number_of_total_results', len(issues))
             
         except Exception as e:
             logger.error(f"Error fetching issues for volume {volume_id}: {e}")
-            return []
+            return [], 0
     
     async def _make_request(self, endpoint: str, params: dict) -> Optional[Dict]:
         """Make API request to ComicVine"""
@@ -221,28 +287,12 @@ class ComicVineService:
         if not volume:
             return {}
         
-        # Get cover image
-        image = volume.get('image', {}) or {}
-        cover_image = (
-            image.get('original_url') or
-            image.get('super_url') or
-            image.get('screen_large_url') or
-            image.get('medium_url')
-        )
-        
-        # Get publisher name
-        publisher = volume.get('publisher')
-        publisher_name = publisher.get('name') if isinstance(publisher, dict) else None
-        
-        # Clean description (remove HTML)
-        description = self._clean_html(volume.get('description') or volume.get('deck') or '')
-        
         result = {
             'comicvine_id': volume.get('id'),
             'title': volume.get('name', 'Unknown'),
-            'description': description,
-            'cover_image': cover_image,
-            'publisher': publisher_name,
+            'description': self._volume_description(volume),
+            'cover_image': self._volume_cover_image(volume),
+            'publisher': self._volume_publisher_name(volume),
             'start_year': volume.get('start_year'),
             'count_of_issues': volume.get('count_of_issues'),
             'comicvine_url': volume.get('site_detail_url'),
@@ -285,6 +335,21 @@ class ComicVineService:
         
         return result
     
+    def _transform_search_item(self, volume: Dict) -> VolumeSearchItem:
+        """Transform a ComicVine search hit to a VolumeSearchItem"""
+        start_year = volume.get('start_year')
+
+        return VolumeSearchItem(
+            comicvine_id=volume.get('id'),
+            title=volume.get('name', 'Unknown'),
+            description=self._volume_description(volume),
+            cover_image=self._volume_cover_image(volume),
+            publisher=self._volume_publisher_name(volume),
+            start_year=int(start_year) if str(start_year or '').isdigit() else None,
+            count_of_issues=volume.get('count_of_issues'),
+            comicvine_url=volume.get('site_detail_url'),
+        )
+
     def _transform_issue(self, issue: Dict) -> Dict:
         """Transform ComicVine issue to our format"""
         if not issue:
@@ -333,6 +398,25 @@ class ComicVineService:
             'colorists': list(set(colorists)),
         }
     
+    def _volume_cover_image(self, volume: Dict) -> Optional[str]:
+        """Largest available cover image URL of a volume"""
+        image = volume.get('image') or {}
+        return (
+            image.get('original_url') or
+            image.get('super_url') or
+            image.get('screen_large_url') or
+            image.get('medium_url')
+        )
+    
+    def _volume_publisher_name(self, volume: Dict) -> Optional[str]:
+        """Publisher name of a volume"""
+        publisher = volume.get('publisher')
+        return publisher.get('name') if isinstance(publisher, dict) else None
+    
+    def _volume_description(self, volume: Dict) -> str:
+        """Volume description (or deck) without HTML"""
+        return self._clean_html(volume.get('description') or volume.get('deck') or '')
+    
     def _clean_html(self, text: str) -> str:
         """Remove HTML tags from text"""
         if not text:
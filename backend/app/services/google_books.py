@@ -10,9 +10,13 @@ import logging
 import os
 from typing import List, Dict, Optional
 from urllib.parse import quote
+from app.utils.cache import async_ttl_cache
 
 logger = logging.getLogger(__name__)
 
+# Metadata rarely changes; cache API responses for an hour
+CACHE_TTL = 3600
+
 
 class GoogleBooksService:
     """
@@ -33,6 +37,11 @@ class GoogleBooksService:
         if not self.api_key:
             logger.warning("Google Books API key not configured. Rate limits may apply.")
 
+    @async_ttl_cache(
+        ttl=CACHE_TTL,
+        key=lambda query, page=1, per_page=20, language=None: (query.strip().lower(), page, per_page, language),
+        cache_if=lambda result: bool(result and result.get('results'))
+    )
     async def search_books(
         self,
         query: str,
@@ -87,6 +96,7 @@ class GoogleBooksService:
             logger.error(f"Error searching Google Books: {e}")
             return {'results': [], 'total': 0}
 
+    @async_ttl_cache(ttl=CACHE_TTL, maxsize=10000)
     async def get_book_by_id(self, volume_id: str) -> Optional[Dict]:
         """
         Get detailed book information by Google Books volume ID
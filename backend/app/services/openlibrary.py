@@ -8,9 +8,13 @@ import aiohttp
 import asyncio
 import logging
 from typing import List, Dict, Optional
+from app.utils.cache import async_ttl_cache
 
 logger = logging.getLogger(__name__)
 
+# Metadata rarely changes; cache API responses for an hour
+CACHE_TTL = 3600
+
 
 class OpenLibraryService:
     """
@@ -21,6 +25,11 @@ class OpenLibraryService:
     API_URL = "https://openlibrary.org"
     COVERS_URL = "https://covers.openlibrary.org"
 
+    @async_ttl_cache(
+        ttl=CACHE_TTL,
+        key=lambda query, page=1, per_page=20: (query.strip().lower(), page, per_page),
+        cache_if=lambda result: bool(result and result.get('results'))
+    )
     async def search_books(
         self,
         query: str,
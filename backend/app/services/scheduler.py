@@ -6,8 +6,8 @@ Handles automated tasks like checking for new chapters, downloads, conversions
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import and_, update
 from app.database import SessionLocal
 from app.models.manga import Manga
 from app.models.chapter import Chapter
@@ -18,7 +18,7 @@ from app.services.scraper import TomosMangaScraper
 from app.services.downloader import MangaDownloader
 from app.services.book_downloader import BookDownloader
 from app.services.converter import KCCConverter
-from app.services.stk_kindle_sender import STKKindleSender
+from app.services.stk_kindle_sender import get_stk_sender
 from pathlib import Path
 from datetime import datetime, timedelta
 import logging
@@ -691,8 +691,8 @@ class MangaScheduler:
             # Si encontramos archivos convertidos, actualizar DB
             if converted_files:
                 chapter.status = 'converted'
-                # Guardar todas las rutas separadas por '|' para archivos divididos
-                chapter.converted_path = '|'.join(str(f) for f in converted_files)
+                # Guardar todas las rutas (y tamaños) para archivos divididos
+                chapter.set_converted_files(converted_files)
                 chapter.converted_at = datetime.utcnow()
                 db.commit()
 
@@ -767,7 +767,7 @@ class MangaScheduler:
 
             if output_file and output_file.exists():
                 chapter.status = 'converted'
-                chapter.converted_path = str(output_file)
+                chapter.set_converted_files([output_file])
                 chapter.converted_at = datetime.utcnow()
                 logger.info(f"Local conversion completed: {output_file.name}")
             else:
@@ -808,8 +808,10 @@ class MangaScheduler:
                 logger.debug("STK device not configured, skipping")
                 return
 
-            # Obtener capítulos convertidos no enviados
-            chapters = db.query(Chapter).filter(
+            # Obtener capítulos convertidos no enviados (con su manga, en la misma consulta)
+            chapters = db.query(Chapter).options(
+                joinedload(Chapter.manga)
+            ).filter(
                 Chapter.status == 'converted'
             ).limit(3).all()
 
@@ -818,93 +820,84 @@ class MangaScheduler:
 
             logger.info(f"Sending {len(chapters)} chapters to Kindle via STK")
 
+            sent_ids = []
             for chapter in chapters:
-                await self._send_chapter_to_kindle(chapter.id, settings)
+                if await self._send_chapter_to_kindle(chapter, settings):
+                    sent_ids.append(chapter.id)
+
+            # Marcar todos los enviados con un único UPDATE
+            if sent_ids:
+                db.execute(
+                    update(Chapter).where(Chapter.id.in_(sent_ids)).values(
+                        status='sent',
+                        sent_at=datetime.utcnow()
+                    )
+                )
+                db.commit()
 
         except Exception as e:
             logger.error(f"Error in send_to_kindle: {e}")
         finally:
             db.close()
 
-    async def _send_chapter_to_kindle(self, chapter_id: int, settings=None):
+    async def _send_chapter_to_kindle(self, chapter: Chapter, settings) -> bool:
         """
         Envía un capítulo individual al Kindle usando STK.
 
-        Soporta archivos divididos en partes (rutas separadas por '|' en converted_path).
+        Soporta archivos divididos en partes (una entrada por parte en converted_files).
+        Devuelve True solo si todas las partes se enviaron correctamente;
+        el llamador se encarga de marcar el capítulo como enviado.
         """
-        db: Session = SessionLocal()
         try:
-            chapter = db.query(Chapter).filter(Chapter.id == chapter_id).first()
-            if not chapter or not chapter.converted_path:
-                return
+            manga = chapter.manga
+            if not chapter.converted_path or not manga:
+                return False
 
-            manga = db.query(Manga).filter(Manga.id == chapter.manga_id).first()
-            if not manga:
-                return
+            # Manejar múltiples archivos (partes)
+            file_paths = chapter.converted_file_paths
 
-            # Manejar múltiples archivos (partes) separados por '|'
-            file_paths = [Path(p.strip()) for p in chapter.converted_path.split('|') if p.strip()]
-
-            # Verificar que todos los archivos existen
-            missing_files = [f for f in file_paths if not f.exists()]
+            # Verificar que todos los archivos existen (en un hilo: no bloquear el event loop)
+            missing_files = await asyncio.to_thread(
+                lambda: [f for f in file_paths if not f.exists()]
+            )
             if missing_files:
                 logger.error(f"Converted files not found: {[str(f) for f in missing_files]}")
-                return
+                return False
 
             if len(file_paths) > 1:
                 logger.info(f"Sending {len(file_paths)} parts for {manga.title} Ch {int(chapter.number)}")
 
-            # Get settings from DB if not provided
-            if not settings:
-                from app.models.settings import AppSettings
-                settings = db.query(AppSettings).first()
-                if not settings:
-                    logger.error("No settings configured")
-                    return
-
             if not settings.stk_device_serial:
                 logger.error("STK device not configured")
-                return
+                return False
 
-            # Send via STK
-            stk_sender = STKKindleSender()
-
-            all_success = True
-            for idx, file_path in enumerate(file_paths):
-                file_size_mb = file_path.stat().st_size / (1024 * 1024)
-                part_info = f" (Part {idx + 1}/{len(file_paths)})" if len(file_paths) > 1 else ""
-                logger.info(f"Sending to Kindle via STK: {file_path.name}{part_info} ({file_size_mb:.1f}MB)")
-
-                try:
-                    success = await stk_sender.send_file(
-                        file_path=str(file_path),
-                        device_serial=settings.stk_device_serial
-                    )
+            # Send via STK (shared client: the session is loaded once per process)
+            stk_sender = get_stk_sender()
 
-                    if success:
-                        logger.info(f"Sent via STK: {file_path.name}")
-                    else:
-                        logger.error(f"Failed to send via STK: {file_path.name}")
-                        all_success = False
+            # Las partes se suben en paralelo (send_file bloquea, corre en hilos)
+            results = await stk_sender.send_files(
+                [(file_path, None) for file_path in file_paths],
+                device_serials=[settings.stk_device_serial]
+            )
 
-                except Exception as e:
-                    logger.error(f"STK send failed for {file_path.name}: {e}")
+            all_success = True
+            for file_path, result in zip(file_paths, results):
+                if result['success']:
+                    logger.info(f"Sent via STK: {file_path.name}")
+                else:
+                    logger.error(f"Failed to send via STK: {file_path.name}: {result['message']}")
                     all_success = False
 
-            # Marcar como enviado solo si todas las partes se enviaron correctamente
             if all_success:
-                chapter.status = 'sent'
-                chapter.sent_at = datetime.utcnow()
                 logger.info(f"Successfully sent all parts to Kindle for {manga.title} Ch {int(chapter.number)}")
             else:
                 logger.error(f"Some parts failed to send for {manga.title} Ch {int(chapter.number)}")
 
-            db.commit()
+            return all_success
 
         except Exception as e:
             logger.error(f"Error in _send_chapter_to_kindle: {e}")
-        finally:
-            db.close()
+            return False
 
     async def retry_failed_downloads(self):
         """Reintenta descargas fallidas"""
@@ -968,6 +961,7 @@ class MangaScheduler:
                 # Actualizar DB (opcional: eliminar registros o solo paths)
                 chapter.file_path = None
                 chapter.converted_path = None
+                chapter.converted_files = None
 
             db.commit()
             logger.info(f"Cleaned up {cleaned_count} old files")
@@ -4,17 +4,29 @@ Uses stkclient library for Amazon's Send to Kindle API
 Supports OAuth2 authentication and large files (>10MB)
 """
 
+import asyncio
 import json
 import logging
+import threading
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import stkclient
+from app.utils.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 # Storage for serialized client
 CLIENT_FILE = Path("/app/data/stk_client.json")
 
+# The device list is fetched from Amazon; /stk/status is polled before every send
+DEVICES_CACHE_TTL = 60
+
+# Parts of a split tomo uploaded to Amazon at the same time
+UPLOAD_CONCURRENCY = 2
+
+# Largest document Send to Kindle accepts
+MAX_FILE_SIZE = 200 * 1024 * 1024
+
 
 class STKKindleSender:
     """
@@ -25,6 +37,10 @@ class STKKindleSender:
     def __init__(self):
         self.client: Optional[stkclient.Client] = None
         self.oauth: Optional[stkclient.OAuth2] = None
+        self._devices_cache = TTLCache(ttl=DEVICES_CACHE_TTL, maxsize=1)
+        # Uploads run in worker threads against this one shared client; the
+        # lock makes concurrent parts wait for a single device lookup
+        self._devices_lock = threading.RLock()
         self._load_client()
 
     def _load_client(self) -> bool:
@@ -81,6 +97,8 @@ class STKKindleSender:
 
         try:
             self.client = self.oauth.create_client(redirect_url)
+            with self._devices_lock:
+                self._devices_cache.clear()
             self._save_client()
             logger.info("STK authorization completed successfully")
             return True
@@ -113,25 +131,7 @@ class STKKindleSender:
             return []
 
         try:
-            devices_response = self.client.get_owned_devices()
-
-            # Handle both formats: list directly or object with owned_devices attribute
-            if isinstance(devices_response, list):
-                devices = devices_response
-            elif hasattr(devices_response, 'owned_devices'):
-                devices = devices_response.owned_devices
-            else:
-                logger.warning(f"Unexpected devices response type: {type(devices_response)}")
-                return []
-
-            result = []
-            for d in devices:
-                result.append({
-                    'serial': d.device_serial_number,
-                    'name': getattr(d, 'device_name', 'Kindle'),
-                    'type': getattr(d, 'device_type', 'Unknown')
-                })
-            return result
+            return self._cached_devices()
         except Exception as e:
             error_msg = str(e)
             logger.error(f"Failed to get Kindle devices: {error_msg}")
@@ -142,6 +142,38 @@ class STKKindleSender:
 
             return []
 
+    def _cached_devices(self) -> List[Dict[str, Any]]:
+        """Device list from cache or Amazon; raises on failure (errors are not cached)"""
+        with self._devices_lock:
+            hit, cached = self._devices_cache.get("devices")
+            if hit:
+                return cached
+
+            devices = self._fetch_devices()
+            self._devices_cache.set("devices", devices)
+            return devices
+
+    def _fetch_devices(self) -> List[Dict[str, Any]]:
+        """Query Amazon for the owned devices"""
+        devices_response = self.client.get_owned_devices()
+
+        # Handle both formats: list directly or object with owned_devices attribute
+        if isinstance(devices_response, list):
+            devices = devices_response
+        elif hasattr(devices_response, 'owned_devices'):
+            devices = devices_response.owned_devices
+        else:
+            raise ValueError(f"Unexpected devices response format: {type(devices_response)}")
+
+        return [
+            {
+                'serial': d.device_serial_number,
+                'name': getattr(d, 'device_name', 'Kindle'),
+                'type': getattr(d, 'device_type', 'Unknown')
+            }
+            for d in devices
+        ]
+
     def send_file(
         self,
         file_path: Path,
@@ -167,27 +199,26 @@ class STKKindleSender:
                 'message': 'Not authenticated. Please authorize first.'
             }
 
-        if not file_path.exists():
+        try:
+            file_size = file_path.stat().st_size
+        except FileNotFoundError:
             return {
                 'success': False,
                 'message': f'File not found: {file_path}'
             }
 
+        # Rejected before any network I/O (Amazon would refuse the upload anyway)
+        if file_size > MAX_FILE_SIZE:
+            return {
+                'success': False,
+                'message': f'File too large for Send to Kindle: {file_path.name} ({file_size / (1024 * 1024):.0f}MB)'
+            }
+
         try:
-            # Get devices if not specified
+            # Get devices if not specified (cached, so split parts share one lookup);
+            # lookup errors propagate to the handler below instead of reading as "no devices"
             if not device_serials:
-                devices_response = self.client.get_owned_devices()
-                # Handle both formats: list directly or object with owned_devices attribute
-                if isinstance(devices_response, list):
-                    devices = devices_response
-                elif hasattr(devices_response, 'owned_devices'):
-                    devices = devices_response.owned_devices
-                else:
-                    return {
-                        'success': False,
-                        'message': f'Unexpected devices response format: {type(devices_response)}'
-                    }
-                device_serials = [d.device_serial_number for d in devices]
+                device_serials = [d['serial'] for d in self._cached_devices()]
 
             if not device_serials:
                 return {
@@ -200,7 +231,7 @@ class STKKindleSender:
                 title = file_path.stem
 
             # Send file
-            file_size_mb = file_path.stat().st_size / (1024 * 1024)
+            file_size_mb = file_size / (1024 * 1024)
             logger.info(f"Sending {file_path.name} ({file_size_mb:.0f}MB) to {len(device_serials)} device(s)")
 
             # Determine format from file extension
@@ -243,9 +274,48 @@ class STKKindleSender:
                 'message': str(e)
             }
 
+    async def send_files(
+        self,
+        files: List[Tuple[Path, Optional[str]]],
+        author: Optional[str] = None,
+        device_serials: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Send several files (e.g. the parts of a split tomo) concurrently
+
+        Each upload runs send_file in a worker thread, at most
+        UPLOAD_CONCURRENCY at a time.
+
+        Args:
+            files: (file path, title) pairs; a None title uses the filename
+            author: Author name (optional)
+            device_serials: List of device serial numbers (sends to all if not specified)
+
+        Returns:
+            One send_file result dict per file, in the same order
+        """
+        semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+        async def send(file_path: Path, title: Optional[str]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await asyncio.to_thread(
+                        self.send_file,
+                        file_path=file_path,
+                        title=title,
+                        author=author,
+                        device_serials=device_serials
+                    )
+                except Exception as e:
+                    return {'success': False, 'message': str(e)}
+
+        return await asyncio.gather(*[send(file_path, title) for file_path, title in files])
+
     def logout(self):
         """Clear saved session"""
         self.client = None
+        with self._devices_lock:
+            self._devices_cache.clear()
         CLIENT_FILE.unlink(missing_ok=True)
         logger.info("STK session cleared")
 
@@ -4,6 +4,7 @@ Búsqueda automática de manga en TomosManga.com
 """
 
 import requests
+import threading
 from bs4 import BeautifulSoup
 from typing import List, Dict, Optional
 import logging
@@ -11,19 +12,41 @@ from slugify import slugify
 
 logger = logging.getLogger(__name__)
 
+SEARCH_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
+    'Connection': 'keep-alive'
+}
 
-class TomosMangaSearch:
+
+class _PerThreadSession:
+    """
+    One requests.Session per thread
+
+    The search services are shared singletons whose blocking searches run
+    in worker threads; requests.Session isn't thread-safe, so each thread
+    keeps (and reuses) its own.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @property
+    def session(self) -> requests.Session:
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers.update(SEARCH_HEADERS)
+        return session
+
+
+class TomosMangaSearch(_PerThreadSession):
     """Servicio de búsqueda en TomosManga"""
 
     def __init__(self):
+        super().__init__()
         self.base_url = "https://tomosmanga.com"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
-            'Connection': 'keep-alive'
-        })
 
     def search(self, query: str) -> List[Dict]:
         """
@@ -160,18 +183,12 @@ class TomosMangaSearch:
         return best_match
 
 
-class MangayComicsSearch:
+class MangayComicsSearch(_PerThreadSession):
     """Servicio de búsqueda en MangayComics"""
 
     def __init__(self):
+        super().__init__()
         self.base_url = "https://mangaycomics.com"
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'es-ES,es;q=0.9,en;q=0.8',
-            'Connection': 'keep-alive'
-        })
 
     def search(self, query: str) -> List[Dict]:
         """
@@ -221,4 +238,25 @@ class MangayComicsSearch:
 
         except Exception as e:
             logger.error(f"Error searching MangayComics: {e}")
-            return []
\ No newline at end of file
+            return []
+
+
+# Singleton instances (reuse each requests.Session's keep-alive connections)
+_tomosmanga_search = None
+_mangaycomics_search = None
+
+
+def get_tomosmanga_search() -> TomosMangaSearch:
+    """Get TomosManga search singleton"""
+    global _tomosmanga_search
+    if _tomosmanga_search is None:
+        _tomosmanga_search = TomosMangaSearch()
+    return _tomosmanga_search
+
+
+def get_mangaycomics_search() -> MangayComicsSearch:
+    """Get MangayComics search singleton"""
+    global _mangaycomics_search
+    if _mangaycomics_search is None:
+        _mangaycomics_search = MangayComicsSearch()
+    return _mangaycomics_search
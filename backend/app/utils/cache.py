@@ -0,0 +1,119 @@
+"""
+In-process TTL Cache
+Memoizes async service calls (metadata APIs) for a limited time
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Small LRU cache whose entries expire after `ttl` seconds
+
+    Values are shared between callers, so they must be treated as read-only.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (hit, value) for a key, dropping it if expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return False, None
+
+        self._data.move_to_end(key)
+        return True, value
+
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the least recently used entry if full"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        """Remove a key if present"""
+        self._data.pop(key, None)
+
+    def clear(self):
+        """Remove all entries"""
+        self._data.clear()
+
+
+def async_ttl_cache(
+    ttl: float,
+    maxsize: int = 1024,
+    key: Optional[Callable[..., Hashable]] = None,
+    cache_if: Callable[[Any], bool] = lambda value: value is not None
+):
+    """
+    Decorator to memoize an async method for `ttl` seconds
+
+    Args:
+        ttl: Seconds an entry stays valid
+        maxsize: Max number of entries kept
+        key: Builds the cache key from the call arguments (without self);
+             defaults to the positional and keyword arguments as given
+        cache_if: Only results for which this returns True are cached
+                  (by default failed lookups returning None are not)
+
+    Concurrent calls with the same key share a single upstream call
+    (single-flight), so a burst of identical requests costs one fetch.
+    """
+    def decorator(func):
+        cache = TTLCache(ttl=ttl, maxsize=maxsize)
+        inflight: Dict[Hashable, asyncio.Future] = {}
+
+        def make_key(*args, **kwargs) -> Hashable:
+            return key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            cache_key = make_key(*args, **kwargs)
+
+            hit, value = cache.get(cache_key)
+            if hit:
+                return value
+
+            task = inflight.get(cache_key)
+            if task is None:
+                task = asyncio.ensure_future(func(self, *args, **kwargs))
+                inflight[cache_key] = task
+
+                def _done(finished: asyncio.Future):
+                    inflight.pop(cache_key, None)
+                    if not finished.cancelled() and finished.exception() is None and cache_if(finished.result()):
+                        cache.set(cache_key, finished.result())
+
+                task.add_done_callback(_done)
+
+            # Shield so a cancelled caller doesn't abort the call for the others
+            return await asyncio.shield(task)
+
+        def is_cached(*args, **kwargs) -> bool:
+            """Whether a call with these arguments would be served from cache"""
+            hit, _ = cache.get(make_key(*args, **kwargs))
+            return hit
+
+        def invalidate(*args, **kwargs):
+            """Drop the cached result for these arguments"""
+            cache.pop(make_key(*args, **kwargs))
+
+        wrapper.cache = cache
+        wrapper.is_cached = is_cached
+        wrapper.invalidate = invalidate
+        return wrapper
+
+    return decorator
@@ -0,0 +1,94 @@
+"""
+Per-host Adaptive Concurrency Limiter
+Bounds simultaneous requests to each download host and backs off when throttled
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+from playwright.async_api import TimeoutError as PlaywrightTimeout
+
+logger = logging.getLogger(__name__)
+
+# Errors raised inside a limited block that count as the host throttling us
+TIMEOUT_ERRORS = (asyncio.TimeoutError, aiohttp.ServerTimeoutError, PlaywrightTimeout)
+
+
+@dataclass
+class _HostState:
+    """Concurrency bookkeeping for a single host"""
+    active: int = 0
+    throttled_until: float = 0.0
+    condition: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+
+class AdaptiveHostLimiter:
+    """
+    Limit concurrent requests per host
+
+    Each host gets `max_concurrency` slots. When a host answers 429 or
+    times out, its slots are halved for `backoff` seconds (or Retry-After).
+    """
+
+    def __init__(self, max_concurrency: int = 3, backoff: float = 60.0):
+        self.max_concurrency = max_concurrency
+        self.backoff = backoff
+        self._hosts: Dict[str, _HostState] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """Normalized hostname of a URL"""
+        return (urlparse(url).hostname or '').lower().removeprefix('www.')
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState()
+        return state
+
+    def _limit(self, state: _HostState) -> int:
+        if state.throttled_until > time.monotonic():
+            return max(1, self.max_concurrency // 2)
+        return self.max_concurrency
+
+    def report_throttled(self, host: str, retry_after: Optional[str] = None):
+        """Halve a host's concurrency until the backoff window passes"""
+        delay = float(retry_after) if retry_after and retry_after.isdigit() else self.backoff
+        state = self._state(host)
+        state.throttled_until = max(state.throttled_until, time.monotonic() + delay)
+        logger.warning(f"Host {host} throttled, reducing concurrency for {delay:.0f}s")
+
+    @asynccontextmanager
+    async def limit(self, url: str):
+        """
+        Hold a concurrency slot for the host of `url`
+
+        Timeouts (TIMEOUT_ERRORS) raised inside the block count as throttling.
+        """
+        host = self.host_of(url)
+        state = self._state(host)
+
+        async with state.condition:
+            # Re-check periodically so an expired backoff frees slots again
+            while state.active >= self._limit(state):
+                try:
+                    await asyncio.wait_for(state.condition.wait(), timeout=5)
+                except asyncio.TimeoutError:
+                    pass
+            state.active += 1
+
+        try:
+            yield
+        except TIMEOUT_ERRORS:
+            self.report_throttled(host)
+            raise
+        finally:
+            async with state.condition:
+                state.active -= 1
+                state.condition.notify()
@@ -0,0 +1,18 @@
+"""
+Text Utilities
+String helpers shared by API endpoints and scrapers
+"""
+
+from functools import lru_cache
+from slugify import slugify
+
+
+@lru_cache(maxsize=4096)
+def cached_slugify(text: str) -> str:
+    """
+    Memoized slugify()
+
+    python-slugify is pure Python and does a full Unicode normalization per
+    call; titles repeat a lot across searches and imports.
+    """
+    return slugify(text)
@@ -8,6 +8,24 @@ import {
   FaRedo
 } from 'react-icons/fa';
 
+// The backend uploads in the background; poll the chapter status until it finishes
+const POLL_INTERVAL_MS = 2000;
+const POLL_TIMEOUT_MS = 10 * 60 * 1000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+const waitForSend = async (chapterId) => {
+  const deadline = Date.now() + POLL_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    await sleep(POLL_INTERVAL_MS);
+    const { data } = await mangaApi.getKindleStatus(chapterId);
+    if (!data.sending) {
+      return data;
+    }
+  }
+  throw new Error('El envío está tardando demasiado. Revisa el estado más tarde.');
+};
+
 /**
  * SendToKindleButton Component - Uses STK (Send to Kindle) API
  *
@@ -45,16 +63,30 @@ const SendToKindleButton = ({
         throw new Error('STK no autenticado. Ve a Ajustes para conectar tu cuenta de Amazon.');
       }
 
-      // Send via STK
+      // sent_at before this send, to tell whether the background send succeeded
+      const before = await mangaApi.getKindleStatus(chapterId);
+
+      // Send via STK (queued: the upload runs in the background)
       const response = await mangaApi.stkSendToKindle(chapterId);
 
       if (response.data.ok) {
+        const result = await waitForSend(chapterId);
+
+        if (!result.sent_at || result.sent_at === before.data.sent_at) {
+          throw new Error(result.error_message || 'Error al enviar');
+        }
+
         setStatus('success');
+        // Partial sends succeed but report the files that failed
+        setErrorMessage(result.error_message || '');
         if (onSent) {
-          onSent(chapterId, response.data.sent_at);
+          onSent(chapterId, result.sent_at);
         }
         // Reset to idle after 3 seconds to allow resending
-        setTimeout(() => setStatus('idle'), 3000);
+        setTimeout(() => {
+          setStatus('idle');
+          setErrorMessage('');
+        }, 3000);
       } else {
         setStatus('error');
         setErrorMessage(response.data.message || 'Error al enviar');
@@ -6,6 +6,24 @@ import MangaCard from '../components/MangaCard';
 import BookCard from '../components/BookCard';
 import { FaSearch, FaBook, FaMask, FaBookReader } from 'react-icons/fa';
 
+// Books added from a URL are scraped in the background; poll the book until it finishes
+const POLL_INTERVAL_MS = 2000;
+const POLL_TIMEOUT_MS = 5 * 60 * 1000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+const waitForScrape = async (bookId) => {
+  const deadline = Date.now() + POLL_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    await sleep(POLL_INTERVAL_MS);
+    const { data } = await bookApi.getBook(bookId);
+    if (data.scrape_status !== 'pending_scrape') {
+      return data;
+    }
+  }
+  throw new Error('La obtención del libro está tardando demasiado. Revisa la biblioteca más tarde.');
+};
+
 const Search = () => {
   const [searchParams] = useSearchParams();
   const [activeTab, setActiveTab] = useState('manga'); // manga, comics, books
@@ -79,11 +97,20 @@ const Search = () => {
       // If book has source_url (from scrapers), use addFromUrl
       // Otherwise use addFromGoogleBooks
       if (book.source_url && !book.google_books_id) {
-        await bookApi.addFromUrl({
+        const response = await bookApi.addFromUrl({
           source_url: book.source_url,
           monitored: true,
           auto_download: true,
         });
+        alert(`"${book.title}" se está añadiendo. Te avisaremos cuando termine.`);
+
+        const result = await waitForScrape(response.data.id);
+        if (result.scrape_status === 'scrape_failed') {
+          // Drop the failed placeholder so it doesn't linger in the library
+          await bookApi.deleteBook(result.id).catch(() => {});
+          alert(`No se pudo añadir "${book.title}": ${result.scrape_error || 'error al obtener el libro'}`);
+          return;
+        }
       } else if (book.google_books_id) {
         await bookApi.addFromGoogleBooks({
           google_books_id: book.google_books_id,
@@ -100,7 +127,8 @@ const Search = () => {
       if (query) handleSearch(query);
     } catch (error) {
       console.error('Error añadiendo libro:', error);
-      alert('Error al añadir el libro. Inténtalo de nuevo.');
+      // Request errors get the generic message; the polling timeout explains itself
+      alert(error.isAxiosError ? 'Error al añadir el libro. Inténtalo de nuevo.' : error.message);
     }
   };
 
@@ -9,7 +9,7 @@
 
 -- Enable extensions if needed
 -- CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
--- CREATE EXTENSION IF NOT EXISTS "pg_trgm";
+CREATE EXTENSION IF NOT EXISTS "pg_trgm";
 
 -- Grant privileges
 GRANT ALL PRIVILEGES ON DATABASE alejandria TO manga;